@@ -0,0 +1,281 @@
+"""
+Offline bulk audit: evaluates every AI turn of chat exports on disk through the
+same pipeline as the API, without HTTP or per-client rate limits.
+
+    python -m src.bulk --chats data/chats --vectors data/vectors --output audit.ndjson
+
+Chat inputs may be directories or files: one conversation per .json file, JSON
+arrays, or NDJSON/JSONL (split into byte-range shards). Vectors are one file
+shared by every chat, or a directory matched to chats by the trailing number
+in the file name (sample-chat-conversation-01 <-> sample_context_vectors-01).
+
+Parsing and turn pairing run in a process pool; LLM calls run async in the
+main process, through the same context selection and cache keys as the API.
+Results are appended to --output as NDJSON (failures to
+<output>.errors.ndjson). Shards whose items all succeeded are recorded in
+<output>.checkpoint.json, so an interrupted run resumes where it stopped,
+retries the items that failed, and never re-evaluates an item already in the
+output.
+"""
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.bulk", description="Offline bulk audit of chat exports.")
+    parser.add_argument("--chats", required=True, nargs="+", help="chat files or directories")
+    parser.add_argument("--vectors", required=True, help="one vector file for all chats, or a directory of them")
+    parser.add_argument("--output", required=True, help="NDJSON file results are appended to")
+    parser.add_argument("--turns", help="comma-separated AI turn numbers to audit (default: all)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="parsing processes")
+    parser.add_argument("--concurrency", type=int, default=None, help="in-flight evaluations (default BATCH_CONCURRENCY)")
+    parser.add_argument("--shard-mb", type=float, default=64, help="NDJSON shard size in MB")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and existing output")
+    return parser.parse_args(argv)
+
+def _index_of(path: str) -> Optional[str]:
+    match = re.search(r"(\d+)$", os.path.splitext(os.path.basename(path))[0])
+    return match.group(1).lstrip("0") or "0" if match else None
+
+def list_files(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".json",) + NDJSON_SUFFIXES)
+            )
+        else:
+            files.append(path)
+    return files
+
+def match_vectors(chat_files: List[str], vectors: str) -> dict:
+    """chat file -> vector file (None when a directory holds no match)."""
+    if not os.path.isdir(vectors):
+        return {chat: vectors for chat in chat_files}
+    by_index = {_index_of(path): path for path in list_files([vectors])}
+    return {chat: by_index.get(_index_of(chat)) for chat in chat_files}
+
+def plan_shards(chat_file: str, vector_file: str, shard_bytes: int) -> List[dict]:
+    # Checkpoint ids use the resolved path, like item ids, so a resume may name the files differently.
+    real = os.path.realpath(chat_file)
+    if not chat_file.endswith(NDJSON_SUFFIXES):
+        return [{"id": real, "chat": chat_file, "vectors": vector_file, "start": 0, "end": None}]
+    size = os.path.getsize(chat_file)
+    return [
+        {"id": f"{real}@{start}", "chat": chat_file, "vectors": vector_file,
+         "start": start, "end": min(start + shard_bytes, size)}
+        for start in range(0, max(size, 1), shard_bytes)
+    ]
+
+
+# --- Worker side (runs in the process pool) ---
+
+@lru_cache(maxsize=8)
+def _context(vector_file: str) -> tuple:
+    from src.utils.ingest import load_context
+    with open(vector_file, "rb") as fp:
+        return load_context(fp)
+
+def _conversations(shard: dict):
+    """
+    Yields (position, conversation). The position tells apart conversations that
+    share (or lack) a chat_id: the index in a JSON file, the line's byte offset in
+    NDJSON (stable whatever --shard-mb the run uses).
+    """
+    from src.utils.ingest import iter_conversations
+    if shard["end"] is None:
+        with open(shard["chat"], "rb") as fp:
+            yield from enumerate(iter_conversations(fp))
+        return
+    # A line belongs to the shard its first byte falls in.
+    with open(shard["chat"], "rb") as fp:
+        fp.seek(shard["start"])
+        if shard["start"]:
+            fp.seek(shard["start"] - 1)
+            fp.readline()
+        while fp.tell() < shard["end"]:
+            offset = fp.tell()
+            line = fp.readline()
+            if not line:
+                break
+            if line.strip():
+                yield f"@{offset}", json.loads(line)
+
+def prepare_shard(shard: dict, turns: Optional[List[int]]) -> List[dict]:
+    """
+    Parses one shard and pairs its turns. Each request carries the full context,
+    as an API request would, so AuditService selects from it exactly once.
+    """
+    from src.utils.ingest import pair_turns
+
+    context_texts, context_tokens = _context(shard["vectors"])
+    # Ids survive relative paths, symlinks and a different working directory on resume.
+    source = os.path.realpath(shard["chat"])
+    items = []
+    for position, chat_data in _conversations(shard):
+        for turn, req in pair_turns(chat_data, context_texts, context_tokens, turns):
+            payload = req.model_dump(exclude={"context_texts", "context_tokens"})
+            # The same list objects for every item: pickled once per shard, not once per item.
+            payload["context_texts"] = context_texts
+            payload["context_tokens"] = context_tokens
+            items.append({
+                "item_id": f"{source}:{position}:{payload['conversation_id']}:{turn}",
+                "turn": turn,
+                "request": payload,
+            })
+    return items
+
+
+# --- Main process ---
+
+class Checkpoint:
+    """Finished shard ids, rewritten atomically after every shard."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f).get("completed_shards", []))
+
+    def mark(self, shard_id: str):
+        self.done.add(shard_id)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"completed_shards": sorted(self.done), "updated_at": time.time()}, f)
+        os.replace(tmp, self.path)
+
+def completed_items(output: str) -> set:
+    """Item ids already written; a torn last line from a crash is cut off."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    good_bytes = 0
+    with open(output, "rb") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["item_id"])
+            except (ValueError, KeyError):
+                break
+            good_bytes += len(line)
+    if good_bytes < os.path.getsize(output):
+        with open(output, "r+b") as f:
+            f.truncate(good_bytes)
+    return done
+
+async def evaluate_shard(audit_service, items: List[dict], source: str, out, errors, concurrency: Optional[int]) -> dict:
+    from src.core.config import settings
+    from src.models.schemas import EvaluationRequest
+
+    totals = {"items": 0, "failed": 0, "cost_usd": 0.0}
+    for start in range(0, len(items), settings.BATCH_WINDOW):
+        window = items[start:start + settings.BATCH_WINDOW]
+        requests = [EvaluationRequest(**item["request"]) for item in window]
+        results = await audit_service.evaluate_many(requests, concurrency=concurrency)
+        for item, outcome in zip(window, results):
+            row = {"item_id": item["item_id"], "source": source, "turn": item["turn"]}
+            if outcome.result is None:
+                errors.write(json.dumps({**row, "error": outcome.error}) + "\n")
+                totals["failed"] += 1
+                continue
+            out.write(json.dumps({**row, **json.loads(outcome.result.json())}) + "\n")
+            totals["cost_usd"] += outcome.result.estimated_cost_usd
+        totals["items"] += len(window)
+        out.flush()
+        errors.flush()
+    return totals
+
+async def run(args) -> dict:
+    from src.routes.eval_routes import audit_service
+    from src.services.rate_scheduler import request_priority, PRIORITY_BACKGROUND
+    from src.services.results_store import results_store
+    from src.services.llm_service import close_client
+
+    # Nightly re-audits yield to interactive traffic sharing the same provider budget.
+    request_priority.set(PRIORITY_BACKGROUND)
+    turns = [int(t) for t in args.turns.split(",")] if args.turns else None
+    checkpoint_path = args.output + ".checkpoint.json"
+    errors_path = args.output + ".errors.ndjson"
+    if args.restart:
+        for path in (args.output, checkpoint_path, errors_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    checkpoint = Checkpoint(checkpoint_path)
+    done_items = completed_items(args.output)
+    chat_files = list_files(args.chats)
+    vectors = match_vectors(chat_files, args.vectors)
+    shards = []
+    for chat_file in chat_files:
+        if not vectors[chat_file]:
+            print(f"[Bulk] No vector file matches {chat_file}; skipped.", file=sys.stderr)
+            continue
+        shards += plan_shards(chat_file, vectors[chat_file], int(args.shard_mb * 1024 * 1024))
+    pending = [shard for shard in shards if shard["id"] not in checkpoint.done]
+    print(f"[Bulk] {len(shards)} shards, {len(shards) - len(pending)} already done, "
+          f"{len(done_items)} items in output.", file=sys.stderr)
+
+    summary = {"shards": len(pending), "failed_shards": 0, "retry_shards": 0, "items": 0, "skipped": 0, "failed": 0,
+               "cost_usd": 0.0}
+    loop = asyncio.get_running_loop()
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as pool, \
+            open(args.output, "a") as out, open(errors_path, "a") as errors:
+        # Parsing runs ahead of evaluation by up to two shards per worker.
+        futures = [loop.run_in_executor(pool, prepare_shard, shard, turns) for shard in pending[:args.workers * 2]]
+        next_shard = len(futures)
+        for i, shard in enumerate(pending):
+            if next_shard < len(pending):
+                futures.append(loop.run_in_executor(pool, prepare_shard, pending[next_shard], turns))
+                next_shard += 1
+            try:
+                items = await futures[i]
+            except Exception as e:
+                # Left out of the checkpoint, so the next run tries this shard again.
+                print(f"[Bulk] {shard['id']}: could not be parsed ({e}); skipped.", file=sys.stderr)
+                summary["failed_shards"] += 1
+                continue
+
+            todo = [item for item in items if item["item_id"] not in done_items]
+            summary["skipped"] += len(items) - len(todo)
+            totals = await evaluate_shard(audit_service, todo, shard["chat"], out, errors, args.concurrency)
+            for key in ("items", "failed", "cost_usd"):
+                summary[key] += totals[key]
+            # The shard's rows must be on disk before the checkpoint claims it is done.
+            os.fsync(out.fileno())
+            if totals["failed"]:
+                # Left out of the checkpoint: the next run re-reads the shard and evaluates only the
+                # items missing from the output, i.e. the ones recorded in the errors file.
+                summary["retry_shards"] += 1
+            else:
+                checkpoint.mark(shard["id"])
+            print(f"[Bulk] {shard['id']}: {totals['items']} evaluated, {totals['failed']} failed "
+                  f"({i + 1}/{len(pending)} shards)", file=sys.stderr)
+
+    await results_store.stop()
+    await close_client()
+    summary["cost_usd"] = round(summary["cost_usd"], 6)
+    summary["wall_seconds"] = round(time.perf_counter() - start_time, 2)
+    return summary
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Pipeline logging goes to stderr; stdout carries only the JSON summary.
+    with contextlib.redirect_stdout(sys.stderr):
+        summary = asyncio.run(run(args))
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,118 @@ class Settings:
     INPUT_COST_PER_1K: float = 0.00005
     OUTPUT_COST_PER_1K: float = 0.00008
 
+    # Per-client request limits on the public endpoints (disable for load tests)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+    # Observability: per-evaluation trace spans, kept in memory for /metrics/traces
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+
+    # Outbound LLM client: bare host of a Groq-compatible server (the SDK appends /openai/v1/...)
+    GROQ_BASE_URL: str = os.getenv("GROQ_BASE_URL") or None
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_CONCURRENCY_TIER_1: int = int(os.getenv("LLM_CONCURRENCY_TIER_1", "16"))
+    LLM_CONCURRENCY_TIER_3: int = int(os.getenv("LLM_CONCURRENCY_TIER_3", "4"))
+
+    # Provider rate limits per model (Groq free tier by default); 0 disables a budget
+    LLM_RPM_TIER_1: float = float(os.getenv("LLM_RPM_TIER_1", "30"))
+    LLM_TPM_TIER_1: float = float(os.getenv("LLM_TPM_TIER_1", "6000"))
+    LLM_RPM_TIER_3: float = float(os.getenv("LLM_RPM_TIER_3", "30"))
+    LLM_TPM_TIER_3: float = float(os.getenv("LLM_TPM_TIER_3", "12000"))
+    # Share of the limits actually used, so local estimates never push us over
+    SCHEDULER_HEADROOM: float = float(os.getenv("SCHEDULER_HEADROOM", "0.9"))
+    # Budget that can be spent at once after an idle period
+    SCHEDULER_BURST_SECONDS: float = float(os.getenv("SCHEDULER_BURST_SECONDS", "10"))
+    # Waiting calls per model before the lowest-priority ones are shed
+    SCHEDULER_MAX_QUEUE: int = int(os.getenv("SCHEDULER_MAX_QUEUE", "200"))
+    # Pause after a 429 that carries no Retry-After header
+    SCHEDULER_DEFAULT_BACKOFF_SECONDS: float = float(os.getenv("SCHEDULER_DEFAULT_BACKOFF_SECONDS", "5"))
+    # Completion tokens reserved per call before the real usage is known
+    LLM_EXPECTED_OUTPUT_TOKENS: int = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "150"))
+
+    # Evaluation cache (Layer 0): "memory" (per process), "sqlite" (shared per host) or "redis"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_SQLITE_PATH: str = os.getenv("CACHE_SQLITE_PATH", "eval_cache.db")
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    CACHE_BATCH_SIZE: int = int(os.getenv("CACHE_BATCH_SIZE", "500"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_TTL_HOURS: float = float(os.getenv("CACHE_TTL_HOURS", "24"))
+    CACHE_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "60"))
+
+    # Context selection for the audit prompt
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+    CONTEXT_MAX_CHUNKS: int = int(os.getenv("CONTEXT_MAX_CHUNKS", "5"))
+
+    # Deterministic claim screen (Layer 1.5)
+    SCREEN_SETTLE_ENABLED: bool = os.getenv("SCREEN_SETTLE_ENABLED", "false").lower() == "true"
+    SCREEN_MIN_UNSUPPORTED: int = int(os.getenv("SCREEN_MIN_UNSUPPORTED", "2"))
+    SCREEN_MAX_SUPPORTED_RATIO: float = float(os.getenv("SCREEN_MAX_SUPPORTED_RATIO", "0.34"))
+
+    # Layer 2 -> Layer 3 escalation: "threshold" (legacy: any score < high), "band" or "calibrated"
+    ESCALATION_POLICY: str = os.getenv("ESCALATION_POLICY", "band").lower()
+    ESCALATION_BAND_LOW: float = float(os.getenv("ESCALATION_BAND_LOW", "0.3"))
+    ESCALATION_BAND_HIGH: float = float(os.getenv("ESCALATION_BAND_HIGH", "0.9"))
+    ESCALATION_EXPLORE_RATE: float = float(os.getenv("ESCALATION_EXPLORE_RATE", "0.02"))
+    CALIBRATION_TARGET_AGREEMENT: float = float(os.getenv("CALIBRATION_TARGET_AGREEMENT", "0.9"))
+    CALIBRATION_MIN_SAMPLES: int = int(os.getenv("CALIBRATION_MIN_SAMPLES", "30"))
+
+    # Hedged Layer 3: start the judge alongside the scout when escalation is predicted (non-background only)
+    HEDGING_ENABLED: bool = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+    # Predicted escalation probability needed to hedge
+    HEDGE_THRESHOLD: float = float(os.getenv("HEDGE_THRESHOLD", "0.5"))
+    # Cost cap: Layer 3 tokens per minute that hedges may spend without being used; 0 removes the cap
+    HEDGE_MAX_WASTED_TOKENS_PER_MINUTE: float = float(os.getenv("HEDGE_MAX_WASTED_TOKENS_PER_MINUTE", "2000"))
+    # Observations a feature group needs before its own escalation rate outweighs the global one
+    HEDGE_PRIOR_STRENGTH: float = float(os.getenv("HEDGE_PRIOR_STRENGTH", "20"))
+
+    # Batch evaluation
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "2000"))
+    # Items pulled from a (streamed) export and evaluated together
+    BATCH_WINDOW: int = int(os.getenv("BATCH_WINDOW", "256"))
+    # Concurrent identical evaluations share one in-flight LLM call (per process)
+    COALESCING_ENABLED: bool = os.getenv("COALESCING_ENABLED", "true").lower() == "true"
+    # Packs several batch items into one LLM call (shared instructions and context)
+    PACKED_PROMPTS_ENABLED: bool = os.getenv("PACKED_PROMPTS_ENABLED", "false").lower() == "true"
+    PACKED_PROMPT_TOKEN_BUDGET: int = int(os.getenv("PACKED_PROMPT_TOKEN_BUDGET", "4000"))
+    PACKED_PROMPT_MAX_ITEMS: int = int(os.getenv("PACKED_PROMPT_MAX_ITEMS", "10"))
+
+    # Durable background evaluation queue (/evaluate/stream)
+    JOB_QUEUE_PATH: str = os.getenv("JOB_QUEUE_PATH", "eval_jobs.db")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_MAX_DEPTH: int = int(os.getenv("JOB_MAX_DEPTH", "1000"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BASE_SECONDS: float = float(os.getenv("JOB_RETRY_BASE_SECONDS", "2"))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+
+    # Persistent results store
+    RESULTS_DB_PATH: str = os.getenv("RESULTS_DB_PATH", "eval_results.db")
+    RESULTS_BATCH_SIZE: int = int(os.getenv("RESULTS_BATCH_SIZE", "200"))
+    RESULTS_FLUSH_SECONDS: float = float(os.getenv("RESULTS_FLUSH_SECONDS", "2"))
+
+    # Semantic near-duplicate cache (Layer 0.5)
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+    SEMANTIC_CACHE_DIM: int = int(os.getenv("SEMANTIC_CACHE_DIM", "512"))
+    # Fraction of semantic hits that still run the LLM to measure the false-reuse rate
+    SEMANTIC_CACHE_AUDIT_RATE: float = float(os.getenv("SEMANTIC_CACHE_AUDIT_RATE", "0.05"))
+
+    # Remote document fetcher (/evaluate/batch-url)
+    FETCH_TIMEOUT_SECONDS: float = float(os.getenv("FETCH_TIMEOUT_SECONDS", "10"))
+    FETCH_MAX_CONNECTIONS: int = int(os.getenv("FETCH_MAX_CONNECTIONS", "20"))
+    FETCH_MAX_BYTES: int = int(os.getenv("FETCH_MAX_BYTES", str(20 * 1024 * 1024)))
+    FETCH_CACHE_MAX_ENTRIES: int = int(os.getenv("FETCH_CACHE_MAX_ENTRIES", "64"))
+    FETCH_CACHE_MAX_BYTES: int = int(os.getenv("FETCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Cached documents younger than this are served without revalidating
+    FETCH_REVALIDATE_SECONDS: float = float(os.getenv("FETCH_REVALIDATE_SECONDS", "30"))
+
+    # Response-time SLA for /analytics/latency (user turn -> AI turn, seconds)
+    LATENCY_SLA_SECONDS: float = float(os.getenv("LATENCY_SLA_SECONDS", "30"))
+
     @classmethod
     def validate(cls):
         if not cls.GROQ_API_KEY:
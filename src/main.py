@@ -5,9 +5,14 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from src.core.config import settings
-from src.routes import eval_routes
+from src.routes import eval_routes, results_routes, analytics_routes, metrics_routes
+from src.services.llm_service import close_client
+from src.services.job_queue import job_queue
+from src.services.results_store import results_store
+from src.services.remote_fetcher import remote_fetcher
+from src.services.cache_service import cache
 
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=settings.RATE_LIMIT_ENABLED)
 
 app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION)
 
@@ -23,6 +28,23 @@ app.add_middleware(
 )
 
 app.include_router(eval_routes.router, prefix="/api/v1")
+app.include_router(results_routes.router, prefix="/api/v1")
+app.include_router(analytics_routes.router, prefix="/api/v1")
+# Scrapers expect /metrics at the root, not under the API prefix.
+app.include_router(metrics_routes.router)
+
+@app.on_event("startup")
+async def startup():
+    await job_queue.start(eval_routes.persist_evaluation)
+    await results_store.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_queue.stop()
+    await results_store.stop()
+    await remote_fetcher.close()
+    await cache.close()
+    await close_client()
 
 @app.get("/")
 @limiter.limit("5/minute")
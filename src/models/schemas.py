@@ -6,7 +6,9 @@ class EvaluationRequest(BaseModel):
     conversation_id: int
     user_query: str = Field(..., max_length=10000) 
     ai_response: str = Field(..., max_length=20000)
-    context_texts: List[str] = Field(..., max_items=50)
+    context_texts: List[str] = Field(..., max_length=50)
+    # Optional per-chunk token counts (the `tokens` field of vector exports)
+    context_tokens: Optional[List[Optional[int]]] = None
     
     user_timestamp: Optional[str] = None
     ai_timestamp: Optional[str] = None
@@ -32,7 +34,45 @@ class EvaluationResult(BaseModel):
     
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+class JobStatus(BaseModel):
+    id: str
+    status: str = Field(..., description="queued | running | done | dead")
+    attempts: int
+    result: Optional[EvaluationResult] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
 class BatchLinkRequest(BaseModel):
     chat_url: str
     vector_url: str
-    target_turn: int = 14
\ No newline at end of file
+    # None audits every AI turn in the conversation
+    target_turn: Optional[int] = 14
+
+class ConversationBatchItem(BaseModel):
+    chat: dict
+    vectors: dict
+    # AI turn numbers to audit; None audits every AI turn
+    turns: Optional[List[int]] = None
+
+class BatchEvaluationRequest(BaseModel):
+    conversations: List[ConversationBatchItem] = Field(..., min_length=1, max_length=500)
+
+class BatchItemResult(BaseModel):
+    conversation_id: int
+    turn: Optional[int] = None
+    result: Optional[EvaluationResult] = None
+    error: Optional[str] = None
+    deduplicated: bool = Field(False, description="Identical item earlier in the batch; result shared, cost counted once")
+
+class BatchEvaluationResponse(BaseModel):
+    items: List[BatchItemResult]
+    total_items: int
+    unique_items: int
+    failed_items: int
+    total_cost_usd: float
+    wall_seconds: float
+    mean_eval_seconds: float
+    max_eval_seconds: float
+    # True when a streamed upload had more than BATCH_MAX_ITEMS turns; only the first ones were evaluated.
+    truncated: bool = False
\ No newline at end of file
@@ -0,0 +1,26 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from src.core.config import settings
+from src.utils.ingest import iter_conversations
+from src.utils.latency_analytics import analyze_conversations
+
+router = APIRouter()
+
+@router.post("/analytics/latency")
+def conversation_latency(
+    chat_file: UploadFile = File(...),
+    sla_seconds: Optional[float] = Form(None),
+    include_conversations: bool = Form(False),
+):
+    """
+    User -> AI response-time percentiles and SLA breaches for a whole chat export
+    (one conversation, a JSON array or NDJSON), computed in one vectorized pass.
+    """
+    sla = sla_seconds if sla_seconds is not None else settings.LATENCY_SLA_SECONDS
+    try:
+        report = analyze_conversations(iter_conversations(chat_file.file), sla_seconds=sla)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Parsing Error: {e}")
+    if not include_conversations:
+        report["conversations"] = []
+    return report
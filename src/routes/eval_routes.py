@@ -1,107 +1,209 @@
 import json
-import httpx
-from fastapi import APIRouter, HTTPException, UploadFile, File, Request, BackgroundTasks
+import time
+import itertools
+from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from src.models.schemas import EvaluationRequest, EvaluationResult, BatchLinkRequest
+from src.models.schemas import (
+    EvaluationRequest, EvaluationResult, BatchLinkRequest,
+    BatchEvaluationRequest, BatchEvaluationResponse, JobStatus
+)
+from src.core.config import settings
+from src.utils.ingest import pair_turns, stream_turn_requests, vector_items_of
 from src.services.audit_service import AuditService
+from src.services.job_queue import job_queue, QueueFullError
+from src.services.remote_fetcher import remote_fetcher, RemoteFetchError
+from src.services.rate_scheduler import (
+    request_priority, SchedulerOverloadedError, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+)
 
 router = APIRouter()
 audit_service = AuditService()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=settings.RATE_LIMIT_ENABLED)
+
+def overloaded(e: SchedulerOverloadedError) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, round(e.retry_after)))})
+
+def extract_turn_requests(chat_data, vector_data, turns=None):
+    vector_items = vector_items_of(vector_data)
+    context_texts = [item.get('text', '') for item in vector_items]
+    context_tokens = [item.get('tokens') for item in vector_items]
+    return list(pair_turns(chat_data, context_texts, context_tokens, turns))
 
 def extract_context_and_turn(chat_data, vector_data, target_turn):
     try:
-        if 'data' in vector_data and 'vector_data' in vector_data['data']:
-            vector_items = vector_data['data']['vector_data']
-        else:
-            vector_items = vector_data.get('vector_data', [])
-        
-        context_texts = [item.get('text', '') for item in vector_items]
-
-        turns = chat_data.get('chat_conversation', {}).get('conversation_turns', chat_data.get('conversation_turns', []))
-        
-        for i, turn in enumerate(turns):
-            if turn['turn'] == target_turn and turn['role'] == 'AI/Chatbot':
-                user_turn = turns[i-1]
-                return EvaluationRequest(
-                    conversation_id=chat_data.get('chat_id', 0),
-                    user_query=user_turn['message'],
-                    ai_response=turn['message'],
-                    context_texts=context_texts,
-                    user_timestamp=user_turn['created_at'],
-                    ai_timestamp=turn['created_at']
-                )
-        return None
+        pairs = extract_turn_requests(chat_data, vector_data, turns=[target_turn])
+        return pairs[0][1] if pairs else None
     except Exception as e:
         print(f"Parsing Error: {e}")
         return None
 
+async def run_batch(turn_requests) -> BatchEvaluationResponse:
+    """
+    Evaluates an iterable of (turn, EvaluationRequest) in windows of BATCH_WINDOW
+    items, so a lazily parsed export is never fully materialized as requests.
+    Deduplication applies within a window; the cache covers repeats across windows.
+
+    A sized input over BATCH_MAX_ITEMS is rejected before anything is evaluated.
+    A lazy one cannot be counted up front, so evaluation stops at the limit and
+    the (already paid for) results come back with `truncated` set.
+    """
+    if hasattr(turn_requests, "__len__") and len(turn_requests) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.BATCH_MAX_ITEMS} items.")
+
+    start_time = time.perf_counter()
+    items = []
+    turn_iter = iter(turn_requests)
+    truncated = False
+    while True:
+        room = settings.BATCH_MAX_ITEMS - len(items)
+        window = list(itertools.islice(turn_iter, min(settings.BATCH_WINDOW, room)))
+        if not window:
+            truncated = room == 0 and next(turn_iter, None) is not None
+            break
+        window_items = await audit_service.evaluate_many([req for _, req in window])
+        for (turn, _), item in zip(window, window_items):
+            item.turn = turn
+        items.extend(window_items)
+    wall_seconds = round(time.perf_counter() - start_time, 4)
+
+    results = [item.result for item in items if item.result is not None]
+    eval_seconds = [r.eval_execution_seconds for r in results]
+
+    return BatchEvaluationResponse(
+        items=items,
+        total_items=len(items),
+        unique_items=sum(1 for item in items if not item.deduplicated),
+        failed_items=sum(1 for item in items if item.error is not None),
+        total_cost_usd=round(sum(r.estimated_cost_usd for r in results), 6),
+        wall_seconds=wall_seconds,
+        mean_eval_seconds=round(sum(eval_seconds) / len(eval_seconds), 4) if eval_seconds else 0.0,
+        max_eval_seconds=max(eval_seconds, default=0.0),
+        truncated=truncated,
+    )
+
 
 @router.post("/evaluate", response_model=EvaluationResult)
 @limiter.limit("10/minute") 
 async def evaluate(request: Request, payload: EvaluationRequest):
+    # A caller is waiting on this one: its LLM calls go ahead of batch and background work.
+    request_priority.set(PRIORITY_INTERACTIVE)
     try:
         return await audit_service.evaluate_interaction(payload)
+    except SchedulerOverloadedError as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/evaluate/batch")
 @limiter.limit("5/minute")
-async def evaluate_batch_file(request: Request, chat_file: UploadFile = File(...), vector_file: UploadFile = File(...)):
+async def evaluate_batch_file(
+    request: Request,
+    chat_file: UploadFile = File(...),
+    vector_file: UploadFile = File(...),
+    target_turn: Optional[int] = Form(None),
+):
+    """
+    Audits one AI turn when `target_turn` is given, otherwise every AI turn.
+    `chat_file` may hold one conversation, a JSON array of them, or NDJSON;
+    both files are parsed incrementally from the spooled upload.
+    """
     try:
-        chat_content = await chat_file.read()
-        vector_content = await vector_file.read()
-        
-        req_payload = extract_context_and_turn(json.loads(chat_content), json.loads(vector_content), target_turn=14)
-        
-        if not req_payload:
-            return {"error": "Target turn 14 not found."}
-            
-        return await audit_service.evaluate_interaction(req_payload)
+        turn_requests = stream_turn_requests(
+            chat_file.file, vector_file.file,
+            turns=[target_turn] if target_turn is not None else None,
+        )
+
+        if target_turn is None:
+            return await run_batch(turn_requests)
+
+        first = next(turn_requests, None)
+        if not first:
+            return {"error": f"Target turn {target_turn} not found."}
+
+        return await audit_service.evaluate_interaction(first[1])
+    except HTTPException:
+        raise
+    except SchedulerOverloadedError as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/evaluate/batch/conversations", response_model=BatchEvaluationResponse)
+@limiter.limit("5/minute")
+async def evaluate_conversations(request: Request, payload: BatchEvaluationRequest):
+    """Audits the selected (default: all) AI turns of many conversations in one request."""
+    try:
+        turn_requests = []
+        for item in payload.conversations:
+            turn_requests.extend(extract_turn_requests(item.chat, item.vectors, turns=item.turns))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Parsing Error: {e}")
+
+    if not turn_requests:
+        raise HTTPException(status_code=404, detail="No AI turns found.")
+    return await run_batch(turn_requests)
+
 @router.post("/evaluate/batch-url")
 @limiter.limit("5/minute")
 async def evaluate_batch_url(request: Request, payload: BatchLinkRequest):
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        try:
-            chat_resp = await client.get(payload.chat_url)
-            vector_resp = await client.get(payload.vector_url)
-            
-            req_payload = extract_context_and_turn(
-                chat_resp.json(), 
-                vector_resp.json(), 
-                target_turn=payload.target_turn
-            )
-
-            if not req_payload:
-                raise HTTPException(status_code=404, detail="Target turn not found.")
-
-            return await audit_service.evaluate_interaction(req_payload)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
-
-
-async def persist_evaluation(payload: EvaluationRequest):
-    result = await audit_service.evaluate_interaction(payload)
-    print(f"[Background Audit] Chat {payload.conversation_id} Score: {result.faithfulness_score} (Latency: {result.eval_execution_seconds}s)")
-
-@router.post("/evaluate/stream")
-async def stream_evaluation(
-    request: Request, 
-    payload: EvaluationRequest, 
-    background_tasks: BackgroundTasks
-):
+    try:
+        chat_data, vector_data = await remote_fetcher.get_many(payload.chat_url, payload.vector_url)
+
+        if payload.target_turn is None:
+            return await run_batch(extract_turn_requests(chat_data, vector_data))
+
+        req_payload = extract_context_and_turn(
+            chat_data, 
+            vector_data, 
+            target_turn=payload.target_turn
+        )
+
+        if not req_payload:
+            raise HTTPException(status_code=404, detail="Target turn not found.")
+
+        return await audit_service.evaluate_interaction(req_payload)
+    except HTTPException:
+        raise
+    except RemoteFetchError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except SchedulerOverloadedError as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def persist_evaluation(payload: dict) -> dict:
+    request_priority.set(PRIORITY_BACKGROUND)
+    request = EvaluationRequest(**payload)
+    result = await audit_service.evaluate_interaction(request)
+    print(f"[Background Audit] Chat {request.conversation_id} Score: {result.faithfulness_score} (Latency: {result.eval_execution_seconds}s)")
+    return json.loads(result.json())
+
+@router.post("/evaluate/stream", status_code=202)
+async def stream_evaluation(request: Request, payload: EvaluationRequest):
     """
     Industry Pattern: Asynchronous 'Fire-and-Forget'.
     Returns 202 Accepted immediately so the Chatbot UI doesn't hang.
+    The job is persisted before returning, so it survives a restart; poll
+    GET /evaluate/jobs/{job_id} for the result.
     """
-    background_tasks.add_task(persist_evaluation, payload)
-    
+    try:
+        job_id = await job_queue.enqueue(payload.model_dump())
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
     return {
         "status": "queued",
         "message": "Evaluation running in background",
-        "conversation_id": payload.conversation_id
-    }
\ No newline at end of file
+        "conversation_id": payload.conversation_id,
+        "job_id": job_id
+    }
+
+@router.get("/evaluate/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import PlainTextResponse
+from src.core.config import settings
+from src.routes.eval_routes import audit_service
+from src.services.cache_service import cache
+from src.services.semantic_cache import semantic_cache
+from src.services.job_queue import job_queue
+from src.services.results_store import results_store
+from src.services.remote_fetcher import remote_fetcher
+from src.services.escalation_policy import escalation_policy
+from src.services.claim_checker import claim_checker
+from src.services.hedge_policy import hedge_policy
+from src.utils.instrumentation import metrics, recent_traces
+
+router = APIRouter()
+
+# Read once per scrape and shared by the gauges (the sqlite cache and the job queue both query for them).
+_cache_stats = {}
+_job_stats = {}
+
+def _cache_lookups() -> dict:
+    return {("hit",): _cache_stats.get("hits", 0), ("miss",): _cache_stats.get("misses", 0)}
+
+def _escalation_decisions() -> dict:
+    stats = escalation_policy.stats()
+    return {("checked",): stats["decisions"], ("escalated",): stats["escalations"]}
+
+# Component state is read when /metrics is scraped, so none of it costs anything per evaluation.
+metrics.gauge("eval_cache_entries", "Entries in the evaluation cache.",
+              fn=lambda: {(): _cache_stats.get("size", 0)})
+metrics.gauge("eval_cache_lookups_total", "Evaluation cache lookups by result.", ("result",), kind="counter",
+              fn=_cache_lookups)
+metrics.gauge("eval_cache_evictions_total", "Entries evicted by size or byte limits.", kind="counter",
+              fn=lambda: {(): _cache_stats.get("evictions", 0)})
+metrics.gauge("eval_cache_expirations_total", "Entries dropped after their TTL.", kind="counter",
+              fn=lambda: {(): _cache_stats.get("expirations", 0)})
+metrics.gauge("semantic_cache_events_total", "Semantic cache lookups, hits, evictions and audits.", ("event",),
+              kind="counter",
+              fn=lambda: {(k,): v for k, v in semantic_cache.stats().items()
+                          if k in ("lookups", "hits", "evictions", "audits", "false_reuses")} if semantic_cache else {})
+metrics.gauge("eval_coalesced_total", "Evaluations that reused an identical in-flight evaluation.", kind="counter",
+              fn=lambda: {(): audit_service.stats()["coalescing"]["coalesced"]})
+metrics.gauge("eval_escalation_decisions_total", "Layer 2 verdicts checked, and how many were escalated.",
+              ("decision",), kind="counter",
+              fn=_escalation_decisions)
+metrics.gauge("eval_claim_screen_total", "Layer 1.5 screens, and how many settled or flagged the item.",
+              ("outcome",), kind="counter",
+              fn=lambda: {(k,): v for k, v in claim_checker.stats().items() if k in ("screened", "settled", "flagged")})
+metrics.gauge("eval_hedge_events_total", "Layer 3 hedges started, won, wasted or skipped, and escalations missed.",
+              ("event",), kind="counter",
+              fn=lambda: {(k,): v for k, v in hedge_policy.stats().items()
+                          if k in ("hedged", "wins", "wasted", "missed", "skipped_budget", "skipped_busy")})
+metrics.gauge("eval_hedge_wasted_tokens_total", "Layer 3 tokens spent on hedges that were not needed.", kind="counter",
+              fn=lambda: {(): hedge_policy.stats()["wasted_tokens"]})
+metrics.gauge("job_queue_jobs", "Background evaluation jobs by status.", ("status",),
+              fn=lambda: {(k,): v for k, v in _job_stats.items() if k not in ("workers", "max_depth")})
+metrics.gauge("results_store_buffered_rows", "Evaluations waiting for the next batched write.",
+              fn=lambda: {(): results_store.stats().get("buffered", 0)})
+metrics.gauge("remote_fetch_events_total", "batch-url document fetches by outcome.", ("event",), kind="counter",
+              fn=lambda: {(k,): v for k, v in remote_fetcher.stats().items()
+                          if k in ("fresh_hits", "revalidated", "downloads", "evictions")})
+
+# Both handlers are async so they read the registry on the event loop, the only
+# place it is mutated; in the threadpool they could race a concurrent update.
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition format (0.0.4)."""
+    _cache_stats.clear()
+    _cache_stats.update(await cache.stats())
+    _job_stats.clear()
+    _job_stats.update(await job_queue.stats())
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/metrics/traces")
+async def traces(limit: int = Query(50, ge=1, le=1000)):
+    """Most recent per-evaluation trace spans (TRACING_ENABLED=true)."""
+    return {"enabled": settings.TRACING_ENABLED, "traces": list(recent_traces)[-limit:]}
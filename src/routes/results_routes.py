@@ -0,0 +1,21 @@
+from typing import Optional
+from fastapi import APIRouter, Query
+from src.services.results_store import results_store
+
+router = APIRouter()
+
+@router.get("/results/conversations/{conversation_id}")
+async def conversation_history(conversation_id: int, limit: int = Query(100, ge=1, le=1000)):
+    """Stored evaluations of one conversation, newest first."""
+    return {
+        "conversation_id": conversation_id,
+        "evaluations": await results_store.conversation_history(conversation_id, limit=limit),
+    }
+
+@router.get("/results/aggregates")
+async def daily_aggregates(days: int = Query(30, ge=1, le=365), model: Optional[str] = None):
+    """
+    Per-day mean scores, escalation rate, cache hit rate and cost, computed in SQL.
+    `model` filters the counts, scores and cost; the two rates always cover all of the day's evaluations.
+    """
+    return {"days": days, "model": model, "daily": await results_store.daily_aggregates(days=days, model=model)}
@@ -1,36 +1,57 @@
 import time
-from src.models.schemas import EvaluationRequest, EvaluationResult
-from src.services.llm_service import GroqClient
-from src.utils.metrics import calculate_latency
+import random
+import asyncio
+from typing import List, Optional
+from src.models.schemas import EvaluationRequest, EvaluationResult, BatchItemResult
+from src.services.llm_service import GroqClient, SYSTEM_PROMPT
+from src.utils.metrics import calculate_latency, estimate_tokens
 from src.core.config import settings
-from src.services.cache_service import cache 
+from src.services.cache_service import cache
+from src.services.cache_keys import context_digest
+from src.services.semantic_cache import semantic_cache
+from src.services.results_store import results_store
+from src.services.context_selector import context_selector
+from src.services.claim_checker import claim_checker
+from src.services.escalation_policy import escalation_policy
+from src.services.hedge_policy import hedge_policy
+from src.services.rate_scheduler import rate_scheduler
+from src.utils.instrumentation import timed, trace, EVALUATIONS, EVALUATION_SECONDS
 
 class AuditService:
     def __init__(self):
         self.llm_client = GroqClient()
+        self._pack_stats = {"packed_calls": 0, "packed_items": 0, "fallback_items": 0}
+        # cache key -> Future of the evaluation currently paying for it
+        self._in_flight = {}
+        self._coalesce_stats = {"leaders": 0, "coalesced": 0}
 
     def _calculate_cost(self, input_toks: int, output_toks: int) -> float:
         in_cost = (input_toks / 1000) * settings.INPUT_COST_PER_1K
         out_cost = (output_toks / 1000) * settings.OUTPUT_COST_PER_1K
         return round(in_cost + out_cost, 6)
 
-    def _build_audit_prompt(self, req: EvaluationRequest) -> str:
-        safe_context = [txt[:2000] for txt in req.context_texts[:5]] 
+    def _select_context(self, req: EvaluationRequest) -> list:
+        return context_selector.select(req.user_query, req.ai_response, req.context_texts, req.context_tokens)
+
+    def _build_audit_prompt(self, req: EvaluationRequest, safe_context: list, flags: Optional[list] = None) -> str:
         context_block = "\n".join([f"[{i+1}] {txt}" for i, txt in enumerate(safe_context)])
-        
+        flag_block = "\n".join(f"- {flag}" for flag in flags or []) or "- none"
+
         return f"""
         ROLE: Strict Compliance Auditor for a Medical/Legal Chatbot.
-        
+
         INPUT DATA:
         [User Query]: "{req.user_query}"
         [AI Response]: "{req.ai_response}"
         [Retrieval Context]:
         {context_block}
-        
+        [Automated Pre-check Flags] (verify these first):
+        {flag_block}
+
         EVALUATION CRITERIA:
         1. RELEVANCE: Does it answer the specific question?
         2. FAITHFULNESS: Is every claim supported by context?
-        
+
         OUTPUT FORMAT (JSON Only):
         {{
             "relevance_score": <float 0.0-1.0>,
@@ -39,17 +60,104 @@ class AuditService:
         }}
         """
 
-    async def evaluate_interaction(self, request: EvaluationRequest) -> EvaluationResult:
+    def _build_packed_prompt(self, items: list) -> str:
+        """
+        One prompt for several (request, state) pairs. Instructions appear once
+        and each distinct context set is listed once, however many items use it.
+        """
+        context_ids = {}
+        context_blocks = []
+        item_blocks = []
+        for i, (req, state) in enumerate(items):
+            digest = state["ctx_digest"]
+            if digest not in context_ids:
+                context_ids[digest] = f"C{len(context_ids) + 1}"
+                chunks = "\n".join(f"[{j+1}] {txt}" for j, txt in enumerate(state["safe_context"]))
+                context_blocks.append(f"[Context {context_ids[digest]}]\n{chunks}")
+            item_block = (
+                f'[Item {i}] (uses Context {context_ids[digest]})\n'
+                f'[User Query]: "{req.user_query}"\n'
+                f'[AI Response]: "{req.ai_response}"'
+            )
+            if state["flags"]:
+                item_block += "\n[Automated Pre-check Flags]: " + "; ".join(state["flags"])
+            item_blocks.append(item_block)
+        contexts = "\n\n".join(context_blocks)
+        interactions = "\n\n".join(item_blocks)
+
+        return f"""
+        ROLE: Strict Compliance Auditor for a Medical/Legal Chatbot.
+        Evaluate EACH item below independently, using only the context it references.
+
+        RETRIEVAL CONTEXTS:
+        {contexts}
+
+        ITEMS:
+        {interactions}
+
+        EVALUATION CRITERIA:
+        1. RELEVANCE: Does it answer the specific question?
+        2. FAITHFULNESS: Is every claim supported by context?
+
+        OUTPUT FORMAT (JSON Only, one entry per item):
+        {{
+            "results": [
+                {{"id": <item number>, "relevance_score": <float 0.0-1.0>, "faithfulness_score": <float 0.0-1.0>, "reasoning": "Concise explanation."}}
+            ]
+        }}
+        """
+
+    def _parse_packed(self, content: dict, n_items: int) -> dict:
+        """Returns {item id: content} for every well-formed entry; malformed ones are left out."""
+        parsed = {}
+        entries = content.get("results") if isinstance(content, dict) else None
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            item_id = entry.get("id")
+            scores = (entry.get("relevance_score"), entry.get("faithfulness_score"))
+            if isinstance(item_id, bool) or not isinstance(item_id, int) or not 0 <= item_id < n_items or item_id in parsed:
+                continue
+            if not all(isinstance(x, (int, float)) and not isinstance(x, bool) and 0 <= x <= 1 for x in scores):
+                continue
+            parsed[item_id] = {
+                "relevance_score": scores[0],
+                "faithfulness_score": scores[1],
+                "reasoning": str(entry.get("reasoning", "Analysis failed.")),
+            }
+        return parsed
+
+    def _prepare(self, request: EvaluationRequest) -> dict:
         start_time = time.perf_counter()
-        chat_latency = calculate_latency(request.user_timestamp, request.ai_timestamp)
-        
+        with timed("context_select"):
+            safe_context = self._select_context(request)
+            # The key covers the exact context the auditor would see, so a verdict
+            # is never reused against a different knowledge base.
+            cache_key = cache.make_key(request.user_query, request.ai_response, safe_context)
+            ctx_digest = context_digest(safe_context)
+        return {
+            "start_time": start_time,
+            "chat_latency": calculate_latency(request.user_timestamp, request.ai_timestamp),
+            "safe_context": safe_context,
+            "cache_key": cache_key,
+            "ctx_digest": ctx_digest,
+            "reused": None,
+            "flags": [],
+        }
+
+    async def _screen(self, request: EvaluationRequest, state: dict) -> Optional[EvaluationResult]:
+        """Runs the zero-cost layers (0, 0.5, 1, 1.5). Returns a result if one of them settles the item."""
+        start_time = state["start_time"]
+        chat_latency = state["chat_latency"]
+
         # --- LAYER 0: CACHE CHECK (Zero Cost) ---
-        cached_data = cache.get(request.user_query, request.ai_response)
-        
+        with timed("cache"):
+            cached_data = await cache.get(state["cache_key"])
+
         if cached_data:
             end_time = time.perf_counter()
             print("Cache Hit! Skipping LLM.")
-            
+
             # We reconstruct the result using the *Cached Scores* # but the *Current Context* (like conversation_id and execution time)
             return EvaluationResult(
                 conversation_id=request.conversation_id,
@@ -57,13 +165,34 @@ class AuditService:
                 faithfulness_score=cached_data["faithfulness_score"],
                 chat_latency_seconds=chat_latency,
                 eval_execution_seconds=round(end_time - start_time, 4),
-                estimated_cost_usd=0.0, 
+                estimated_cost_usd=0.0,
                 reasoning=cached_data["reasoning"],
-                evaluator_model="Cache-Hit" 
+                evaluator_model="Cache-Hit"
             )
 
+        # --- LAYER 0.5: SEMANTIC NEAR-DUPLICATE CHECK (Zero Cost) ---
+        if semantic_cache:
+            with timed("semantic_cache"):
+                reused = semantic_cache.lookup(request.user_query, request.ai_response, state["ctx_digest"])
+            # A small sample of hits still runs the full pipeline so false reuse can be measured.
+            if reused and random.random() >= settings.SEMANTIC_CACHE_AUDIT_RATE:
+                end_time = time.perf_counter()
+                return EvaluationResult(
+                    conversation_id=request.conversation_id,
+                    relevance_score=reused["relevance_score"],
+                    faithfulness_score=reused["faithfulness_score"],
+                    chat_latency_seconds=chat_latency,
+                    eval_execution_seconds=round(end_time - start_time, 4),
+                    estimated_cost_usd=0.0,
+                    reasoning=reused["reasoning"] + f" [Reused near-duplicate verdict, similarity {reused['similarity']}]",
+                    evaluator_model="Semantic-Cache-Hit"
+                )
+            state["reused"] = reused
+
         # --- LAYER 1: DETERMINISTIC GUARDRAILS ---
-        if len(request.ai_response.strip()) < 5:
+        with timed("guardrail"):
+            too_short = len(request.ai_response.strip()) < 5
+        if too_short:
             end_time = time.perf_counter()
             return EvaluationResult(
                 conversation_id=request.conversation_id,
@@ -76,47 +205,378 @@ class AuditService:
                 evaluator_model="Deterministic-Check"
             )
 
-        # --- LAYER 2: THE SCOUT (Llama-8B) ---
-        prompt = self._build_audit_prompt(request)
-        current_model = settings.MODEL_TIER_1 
-        
-        llm_data = self.llm_client.get_json_response(prompt, model_id=current_model)
-        content = llm_data["content"]
-        
+        # --- LAYER 1.5: DETERMINISTIC CLAIM SCREEN ---
+        with timed("claim_screen"):
+            screen = claim_checker.check(request.user_query, request.ai_response, state["safe_context"],
+                                         full_context=request.context_texts)
+        state["flags"] = screen["flags"]
+        if screen["verdict"]:
+            end_time = time.perf_counter()
+            return EvaluationResult(
+                conversation_id=request.conversation_id,
+                relevance_score=screen["verdict"]["relevance_score"],
+                faithfulness_score=screen["verdict"]["faithfulness_score"],
+                chat_latency_seconds=chat_latency,
+                eval_execution_seconds=round(end_time - start_time, 4),
+                estimated_cost_usd=0.0,
+                reasoning=screen["verdict"]["reasoning"],
+                evaluator_model="Deterministic-Claim-Check"
+            )
+        return None
+
+    async def _finalize(self, request: EvaluationRequest, state: dict, content: dict, current_model: str,
+                  total_input: float, total_output: float, tier1_content: Optional[dict] = None) -> EvaluationResult:
+        """Builds the result and updates caches. `tier1_content` is the Layer 2 verdict when the item was escalated."""
         relevance = content.get("relevance_score", 0)
         faithfulness = content.get("faithfulness_score", 0)
-        
-        # --- LAYER 3: THE JUDGE (Llama-70B) ---
-        if relevance < 0.9 or faithfulness < 0.9:
-            print(f"⚠️ Layer 2 ({current_model}) Unsure. Escalating to Layer 3...")
-            current_model = settings.MODEL_TIER_3 
-            llm_data_l3 = self.llm_client.get_json_response(prompt, model_id=current_model)
-            
-            content = llm_data_l3["content"]
-            relevance = content.get("relevance_score", 0)
-            faithfulness = content.get("faithfulness_score", 0)
-            
-            total_input = llm_data["input_tokens"] + llm_data_l3["input_tokens"]
-            total_output = llm_data["output_tokens"] + llm_data_l3["output_tokens"]
-        else:
-            total_input = llm_data["input_tokens"]
-            total_output = llm_data["output_tokens"]
 
         end_time = time.perf_counter()
-        execution_time = round(end_time - start_time, 4)
+        execution_time = round(end_time - state["start_time"], 4)
         cost = self._calculate_cost(total_input, total_output)
 
         result_obj = EvaluationResult(
             conversation_id=request.conversation_id,
             relevance_score=relevance,
             faithfulness_score=faithfulness,
-            chat_latency_seconds=chat_latency,
+            chat_latency_seconds=state["chat_latency"],
             eval_execution_seconds=execution_time,
             estimated_cost_usd=cost,
             reasoning=content.get("reasoning", "Analysis failed.") + f" [Final Decision: {current_model}]",
             evaluator_model=current_model
         )
 
-        cache.set(request.user_query, request.ai_response, result_obj.dict())
-        
+        escalation_policy.record(tier1_content or content, content if tier1_content else None, cost)
+        with timed("cache_write"):
+            await cache.set(state["cache_key"], result_obj.dict())
+            if semantic_cache:
+                verdict = {
+                    "relevance_score": relevance,
+                    "faithfulness_score": faithfulness,
+                    "reasoning": result_obj.reasoning,
+                }
+                if state["reused"]:
+                    semantic_cache.record_audit(state["reused"], verdict)
+                semantic_cache.add(request.user_query, request.ai_response, state["ctx_digest"], verdict)
+
         return result_obj
+
+    def _drop_hedge(self, hedge: asyncio.Task, prompt: str, dispatched: asyncio.Event) -> tuple:
+        """
+        Cancels a Layer 3 hedge that is no longer needed; returns the (input, output) tokens it cost.
+        The client settles the cancelled call's rate-limit reservation the same way: released if it
+        was never sent, counted at the input estimate if it was.
+        """
+        if not hedge.done():
+            hedge.cancel()
+            if not dispatched.is_set():
+                # Still waiting for the scheduler or a concurrency slot: nothing reached the provider.
+                return 0, 0
+            # The prompt may already have been processed (and billed); counted as an upper bound.
+            return estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt), 0
+        if hedge.cancelled() or hedge.exception() is not None:
+            return 0, 0
+        return hedge.result()["input_tokens"], hedge.result()["output_tokens"]
+
+    async def _evaluate_llm(self, request: EvaluationRequest, state: dict, llm_data: Optional[dict] = None,
+                            escalate: Optional[bool] = None) -> EvaluationResult:
+        """
+        Layers 2 and 3 for a single item. `llm_data` is a Layer 2 verdict already
+        obtained from a packed call, and `escalate` the decision already made on it.
+        With HEDGING_ENABLED, an item likely to escalate starts Layer 3 together
+        with Layer 2; the hedge is cancelled if Layer 2 comes back confident.
+        """
+        # --- LAYER 2: THE SCOUT (Llama-8B) ---
+        with timed("prompt_build"):
+            prompt = self._build_audit_prompt(request, state["safe_context"], state["flags"])
+        current_model = settings.MODEL_TIER_1
+        single = llm_data is None
+        features, hedge, reserved, hedge_started = None, None, 0.0, 0.0
+        hedge_dispatched = asyncio.Event()
+
+        if single:
+            if settings.HEDGING_ENABLED:
+                features = hedge_policy.features(request.user_query, state["safe_context"], state["flags"])
+                reserved = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt) + settings.LLM_EXPECTED_OUTPUT_TOKENS
+                if hedge_policy.should_hedge(features, reserved, self.llm_client.saturated(settings.MODEL_TIER_3)):
+                    hedge_started = time.perf_counter()
+                    hedge = asyncio.create_task(self.llm_client.get_json_response(
+                        prompt, model_id=settings.MODEL_TIER_3, on_dispatch=hedge_dispatched.set))
+                    hedge.add_done_callback(lambda t: t.cancelled() or t.exception())
+            try:
+                with timed("tier1"):
+                    llm_data = await self.llm_client.get_json_response(prompt, model_id=current_model)
+            except BaseException:
+                if hedge is not None:
+                    hedge.cancel()
+                raise
+        content = llm_data["content"]
+        total_input = llm_data["input_tokens"]
+        total_output = llm_data["output_tokens"]
+        tier1_content = None
+
+        # --- LAYER 3: THE JUDGE (Llama-70B) ---
+        if escalate is None:
+            escalate = escalation_policy.should_escalate(content)
+        head_start = time.perf_counter() - hedge_started if hedge is not None else 0.0
+        wasted = (0, 0)
+        if escalate:
+            print(f"⚠️ Layer 2 ({current_model}) Unsure. Escalating to Layer 3...")
+            current_model = settings.MODEL_TIER_3
+            with timed("tier3"):
+                if hedge is not None:
+                    llm_data_l3 = await hedge
+                else:
+                    llm_data_l3 = await self.llm_client.get_json_response(prompt, model_id=current_model)
+
+            tier1_content = content
+            content = llm_data_l3["content"]
+            total_input += llm_data_l3["input_tokens"]
+            total_output += llm_data_l3["output_tokens"]
+        elif hedge is not None:
+            # The unused hedge is part of what this item cost.
+            wasted = self._drop_hedge(hedge, prompt, hedge_dispatched)
+            total_input += wasted[0]
+            total_output += wasted[1]
+
+        result = await self._finalize(request, state, content, current_model, total_input, total_output, tier1_content)
+        if single:
+            hedge_policy.record(features, escalate, hedge is not None, result.eval_execution_seconds,
+                                reserved_tokens=reserved, wasted=wasted, head_start=head_start)
+        return result
+
+    async def _evaluate_coalesced(self, request: EvaluationRequest, state: dict) -> EvaluationResult:
+        """
+        Single-flight around Layers 2-3: while one evaluation of a cache key is
+        running, identical requests await its result instead of calling the LLM
+        again, and receive it at zero cost. The cache only helps once that first
+        result is written; this covers the window before it.
+        """
+        key = state["cache_key"]
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            try:
+                shared = await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not this request: evaluate it ourselves.
+                if not leader.cancelled():
+                    raise
+            else:
+                self._coalesce_stats["coalesced"] += 1
+                return shared.model_copy(update={
+                    "conversation_id": request.conversation_id,
+                    "chat_latency_seconds": state["chat_latency"],
+                    "eval_execution_seconds": round(time.perf_counter() - state["start_time"], 4),
+                    "estimated_cost_usd": 0.0,
+                })
+            return await self._evaluate_coalesced(request, state)
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark a failure as retrieved even when nobody else was waiting for it.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        self._coalesce_stats["leaders"] += 1
+        try:
+            result = await self._evaluate_llm(request, state)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def _record(self, result: EvaluationResult):
+        results_store.add(result)
+        EVALUATIONS.inc(result.evaluator_model)
+        EVALUATION_SECONDS.observe(result.eval_execution_seconds, result.evaluator_model)
+
+    async def evaluate_interaction(self, request: EvaluationRequest) -> EvaluationResult:
+        with trace("evaluate_interaction", conversation_id=request.conversation_id):
+            state = self._prepare(request)
+            result = await self._screen(request, state)
+            if result is None:
+                if settings.COALESCING_ENABLED:
+                    result = await self._evaluate_coalesced(request, state)
+                else:
+                    result = await self._evaluate_llm(request, state)
+        self._record(result)
+        return result
+
+    def _pack_budget(self, model_id: str) -> int:
+        """PACKED_PROMPT_TOKEN_BUDGET, clamped so one packed call fits the model's per-minute token budget."""
+        budget = settings.PACKED_PROMPT_TOKEN_BUDGET
+        ceiling = rate_scheduler.for_model(model_id).max_call_tokens
+        if ceiling is not None:
+            budget = min(budget, int(ceiling) - estimate_tokens(SYSTEM_PROMPT) - settings.LLM_EXPECTED_OUTPUT_TOKENS)
+        return budget
+
+    def _pack(self, indices: list, requests: list, states: list, model_id: str) -> list:
+        """Greedily groups items so each packed prompt stays under the token budget."""
+        budget = self._pack_budget(model_id)
+        groups, current, current_tokens, current_contexts = [], [], 0, set()
+        for i in indices:
+            req, state = requests[i], states[i]
+            item_tokens = estimate_tokens(req.user_query) + estimate_tokens(req.ai_response) + 60
+            context_tokens = sum(estimate_tokens(txt) for txt in state["safe_context"])
+            tokens = item_tokens + (0 if state["ctx_digest"] in current_contexts else context_tokens)
+
+            if current and (current_tokens + tokens > budget
+                            or len(current) >= settings.PACKED_PROMPT_MAX_ITEMS):
+                groups.append(current)
+                current, current_tokens, current_contexts = [], 0, set()
+                tokens = item_tokens + context_tokens
+            current.append(i)
+            current_tokens += tokens
+            current_contexts.add(state["ctx_digest"])
+        if current:
+            groups.append(current)
+        return groups
+
+    async def _run_packed(self, indices: list, requests: list, states: list, model_id: str,
+                          semaphore: asyncio.Semaphore) -> dict:
+        """
+        Evaluates `indices` with packed calls on `model_id`. Returns {index: llm_data}
+        for items that came back well-formed; everything else is left to the caller.
+        Tokens of a packed call are split across its items by prompt share.
+        """
+        async def call(group: list) -> dict:
+            tier = "tier1" if model_id == settings.MODEL_TIER_1 else "tier3"
+            with timed("prompt_build"):
+                prompt = self._build_packed_prompt([(requests[i], states[i]) for i in group])
+            try:
+                # One packed call takes one of the batch's concurrency slots.
+                async with semaphore:
+                    with timed(f"{tier}_packed"):
+                        llm_data = await self.llm_client.get_json_response(prompt, model_id=model_id)
+            except Exception as e:
+                print(f"Packed call failed ({model_id}, {len(group)} items): {e}")
+                return {}
+
+            with timed("parse"):
+                parsed = self._parse_packed(llm_data["content"], len(group))
+            self._pack_stats["packed_calls"] += 1
+            self._pack_stats["packed_items"] += len(parsed)
+
+            weights = [estimate_tokens(requests[i].user_query) + estimate_tokens(requests[i].ai_response) for i in group]
+            total_weight = sum(weights)
+            return {
+                group[j]: {
+                    "content": content,
+                    "input_tokens": llm_data["input_tokens"] * weights[j] / total_weight,
+                    "output_tokens": llm_data["output_tokens"] / len(group),
+                }
+                for j, content in parsed.items()
+            }
+
+        # Single-item groups gain nothing from packing and go through the normal path.
+        groups = [g for g in self._pack(indices, requests, states, model_id) if len(g) > 1]
+        merged = {}
+        for part in await asyncio.gather(*(call(g) for g in groups)):
+            merged.update(part)
+        return merged
+
+    async def _evaluate_packed(self, requests: List[EvaluationRequest], semaphore: asyncio.Semaphore) -> list:
+        """Outcomes in request order: an EvaluationResult, or the exception that item failed with."""
+        async def screen(req: EvaluationRequest) -> tuple:
+            state = self._prepare(req)
+            return state, await self._screen(req, state)
+
+        states, outcomes = [], []
+        for screened in await asyncio.gather(*(screen(req) for req in requests), return_exceptions=True):
+            # A failure while preparing one item fails only that item.
+            state, outcome = (None, screened) if isinstance(screened, BaseException) else screened
+            states.append(state)
+            outcomes.append(outcome)
+        pending = [i for i, outcome in enumerate(outcomes) if outcome is None]
+
+        l2 = await self._run_packed(pending, requests, states, settings.MODEL_TIER_1, semaphore)
+        escalate = [i for i in pending if i in l2 and escalation_policy.should_escalate(l2[i]["content"])]
+        if escalate:
+            print(f"⚠️ Layer 2 ({settings.MODEL_TIER_1}) Unsure on {len(escalate)} packed items. Escalating to Layer 3...")
+        l3 = await self._run_packed(escalate, requests, states, settings.MODEL_TIER_3, semaphore)
+        escalate_set = set(escalate)
+
+        async def resolve(i: int) -> EvaluationResult:
+            if i in l3:
+                return await self._finalize(
+                    requests[i], states[i], l3[i]["content"], settings.MODEL_TIER_3,
+                    l2[i]["input_tokens"] + l3[i]["input_tokens"],
+                    l2[i]["output_tokens"] + l3[i]["output_tokens"],
+                    tier1_content=l2[i]["content"],
+                )
+            async with semaphore:
+                if i not in l2:
+                    self._pack_stats["fallback_items"] += 1
+                    return await self._evaluate_llm(requests[i], states[i])
+                # Falls back to single-item calls only for whatever the packed calls could not settle.
+                return await self._evaluate_llm(requests[i], states[i], l2[i], escalate=i in escalate_set)
+
+        resolved = await asyncio.gather(*(resolve(i) for i in pending), return_exceptions=True)
+        for i, outcome in zip(pending, resolved):
+            outcomes[i] = outcome
+        for outcome in outcomes:
+            if isinstance(outcome, EvaluationResult):
+                self._record(outcome)
+        return outcomes
+
+    async def evaluate_many(self, requests: List[EvaluationRequest], concurrency: Optional[int] = None) -> List[BatchItemResult]:
+        """
+        Fans a batch out through evaluate_interaction with bounded concurrency.
+        Identical (query, response, context) items are evaluated once and the
+        result is shared with their duplicates at zero extra cost. With
+        PACKED_PROMPTS_ENABLED the unique items are packed into multi-item calls.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.BATCH_CONCURRENCY)
+        keys = []
+        for i, req in enumerate(requests):
+            try:
+                keys.append(cache.make_key(req.user_query, req.ai_response, self._select_context(req)))
+            except Exception:
+                # Never deduplicated; evaluating it reports the failure as this item's error.
+                keys.append(f"unkeyed:{i}")
+        first_index = {}
+        for i, key in enumerate(keys):
+            first_index.setdefault(key, i)
+
+        async def run(req: EvaluationRequest) -> EvaluationResult:
+            async with semaphore:
+                return await self.evaluate_interaction(req)
+
+        unique = list(first_index.values())
+        if settings.PACKED_PROMPTS_ENABLED:
+            outcomes = await self._evaluate_packed([requests[i] for i in unique], semaphore)
+        else:
+            outcomes = await asyncio.gather(*(run(requests[i]) for i in unique), return_exceptions=True)
+        by_key = {keys[i]: outcome for i, outcome in zip(unique, outcomes)}
+
+        items = []
+        for i, (req, key) in enumerate(zip(requests, keys)):
+            outcome = by_key[key]
+            duplicate = first_index[key] != i
+            if isinstance(outcome, BaseException):
+                items.append(BatchItemResult(conversation_id=req.conversation_id, error=str(outcome), deduplicated=duplicate))
+                continue
+            if duplicate:
+                # Scores are shared; per-turn fields come from the duplicate's own request.
+                outcome = outcome.model_copy(update={
+                    "conversation_id": req.conversation_id,
+                    "chat_latency_seconds": calculate_latency(req.user_timestamp, req.ai_timestamp),
+                    "estimated_cost_usd": 0.0,
+                })
+                self._record(outcome)
+            items.append(BatchItemResult(conversation_id=req.conversation_id, result=outcome, deduplicated=duplicate))
+        return items
+
+    def stats(self) -> dict:
+        return {
+            "packing": dict(self._pack_stats),
+            "coalescing": {**self._coalesce_stats, "in_flight": len(self._in_flight)},
+            "claim_screen": claim_checker.stats(),
+            "escalation": escalation_policy.stats(),
+            "hedging": hedge_policy.stats(),
+            "llm": self.llm_client.stats(),
+        }
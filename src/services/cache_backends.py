@@ -0,0 +1,262 @@
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+class CacheBackend(ABC):
+    """
+    Storage interface behind EvaluationCache. Keys are already hashed strings.
+    Every method is awaitable so a backend doing I/O never blocks the event loop.
+    """
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: dict):
+        ...
+
+    async def set_many(self, items: Dict[str, dict]):
+        for key, value in items.items():
+            await self.set(key, value)
+
+    async def stats(self) -> dict:
+        return {}
+
+    async def get(self, key: str) -> Optional[dict]:
+        return (await self.get_many([key])).get(key)
+
+    async def close(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """
+    In-process LRU + TTL store with O(1) get/set/evict.
+
+    `_entries` is kept in recency order (for LRU eviction) and `_expiry` in
+    insertion order. TTL is constant, so insertion order is also expiry order
+    and a sweep only ever pops expired keys off the front.
+    """
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 86400,
+                 max_bytes: int = 64 * 1024 * 1024, sweep_interval_seconds: float = 60):
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        self.sweep_interval = sweep_interval_seconds
+        self._next_sweep = time.monotonic() + sweep_interval_seconds
+        self._bytes = 0
+        self._counters = {"evictions": 0, "expirations": 0}
+
+    def _remove(self, key: str):
+        _, size = self._entries.pop(key)
+        del self._expiry[key]
+        self._bytes -= size
+
+    def _sweep(self, now: float):
+        while self._expiry:
+            key, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            self._remove(key)
+            self._counters["expirations"] += 1
+        self._next_sweep = now + self.sweep_interval
+
+    async def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        now = time.monotonic()
+        found = {}
+        for key in keys:
+            if key not in self._entries:
+                continue
+            if self._expiry[key] > now:
+                self._entries.move_to_end(key)
+                found[key] = self._entries[key][0]
+            else:
+                self._remove(key)
+                self._counters["expirations"] += 1
+        return found
+
+    async def set(self, key: str, value: dict):
+        now = time.monotonic()
+        size = len(json.dumps(value, default=str))
+
+        if size > self.max_bytes:
+            return
+        if now >= self._next_sweep:
+            self._sweep(now)
+        if key in self._entries:
+            self._remove(key)
+
+        while self._entries and (len(self._entries) >= self.max_size or self._bytes + size > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self._counters["evictions"] += 1
+
+        self._entries[key] = (value, size)
+        self._expiry[key] = now + self.ttl
+        self._bytes += size
+
+    async def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "usage_percent": (len(self._entries) / self.max_size) * 100,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            **self._counters,
+        }
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    On-disk store that survives restarts and is shared by every worker on the
+    host. WAL mode lets readers in other processes proceed while one writes.
+    Eviction is oldest-first and runs every `sweep_interval_seconds` so that
+    inserts never pay for it. Queries run in worker threads; a write lock
+    held by another process then stalls only that thread, not the event loop.
+    """
+    def __init__(self, path: str, max_size: int = 100000, ttl_seconds: float = 86400,
+                 max_bytes: int = 512 * 1024 * 1024, sweep_interval_seconds: float = 60,
+                 batch_size: int = 500):
+        self.path = path
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        self.sweep_interval = sweep_interval_seconds
+        self.batch_size = batch_size
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        self._counters = {"evictions": 0, "expirations": 0}
+
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS eval_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_eval_cache_expires ON eval_cache(expires_at)")
+
+    def _get_many(self, keys: List[str]) -> Dict[str, dict]:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self.batch_size):
+                chunk = keys[i:i + self.batch_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM eval_cache WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*chunk, now),
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = json.loads(value)
+        return found
+
+    def _set(self, key: str, value: dict):
+        now = time.time()
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO eval_cache (key, value, size, expires_at) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), now + self.ttl),
+            )
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def _sweep(self, now: float):
+        self._counters["expirations"] += self._conn.execute(
+            "DELETE FROM eval_cache WHERE expires_at <= ?", (now,)
+        ).rowcount
+
+        count, total_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM eval_cache").fetchone()
+        if count > self.max_size or total_bytes > self.max_bytes:
+            # Drop the soonest-to-expire (= oldest) entries until both budgets fit.
+            overflow = max(count - self.max_size, 0)
+            if total_bytes > self.max_bytes:
+                overflow = max(overflow, int(count * (1 - self.max_bytes / total_bytes)) + 1)
+            self._counters["evictions"] += self._conn.execute(
+                "DELETE FROM eval_cache WHERE key IN "
+                "(SELECT key FROM eval_cache ORDER BY expires_at LIMIT ?)", (overflow,)
+            ).rowcount
+        self._next_sweep = now + self.sweep_interval
+
+    def _count(self) -> tuple:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM eval_cache").fetchone()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def set(self, key: str, value: dict):
+        await asyncio.to_thread(self._set, key, value)
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+    async def stats(self) -> dict:
+        count, total_bytes = await asyncio.to_thread(self._count)
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "size": count,
+            "max_size": self.max_size,
+            "usage_percent": (count / self.max_size) * 100,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            **self._counters,
+        }
+
+
+class RedisBackend(CacheBackend):
+    """
+    Shared store for multi-host deployments. Expiry is delegated to Redis
+    (SET EX) and size limits to the server's maxmemory policy.
+    """
+    def __init__(self, url: str, ttl_seconds: float = 86400, prefix: str = "eval:", batch_size: int = 500, client=None):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis).") from e
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self.ttl = int(ttl_seconds)
+        self.prefix = prefix
+        self.batch_size = batch_size
+
+    async def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        found = {}
+        for i in range(0, len(keys), self.batch_size):
+            chunk = keys[i:i + self.batch_size]
+            values = await self._client.mget([self.prefix + k for k in chunk])
+            for key, value in zip(chunk, values):
+                if value is not None:
+                    found[key] = json.loads(value)
+        return found
+
+    async def set(self, key: str, value: dict):
+        await self._client.set(self.prefix + key, json.dumps(value, default=str), ex=self.ttl)
+
+    async def set_many(self, items: Dict[str, dict]):
+        pipe = self._client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self.prefix + key, json.dumps(value, default=str), ex=self.ttl)
+        await pipe.execute()
+
+    async def stats(self) -> dict:
+        # Count only our keys; the DB may be shared with other applications.
+        size = 0
+        async for _ in self._client.scan_iter(match=self.prefix + "*", count=self.batch_size):
+            size += 1
+        return {"backend": "redis", "size": size}
+
+    async def close(self):
+        await self._client.aclose()
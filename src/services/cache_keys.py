@@ -0,0 +1,26 @@
+import re
+import hashlib
+import unicodedata
+from typing import List
+
+_WHITESPACE = re.compile(r"\s+")
+KEY_VERSION = "v2"
+
+def canonicalize(text: str) -> str:
+    """NFKC-normalizes, case-folds and collapses whitespace so trivially different texts share a key."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+def _digest(*parts: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+def context_digest(context_texts: List[str]) -> str:
+    """Digest of the context chunks actually sent to the auditor, in prompt order."""
+    return _digest(*(canonicalize(txt) for txt in context_texts))
+
+def evaluation_key(query: str, response: str, context_texts: List[str]) -> str:
+    return _digest(KEY_VERSION, canonicalize(query), canonicalize(response), context_digest(context_texts))
@@ -1,46 +1,60 @@
-import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Optional, List
+from src.core.config import settings
+from src.services.cache_backends import CacheBackend, MemoryBackend, SQLiteBackend, RedisBackend
+from src.services.cache_keys import evaluation_key
 
 class EvaluationCache:
-    def __init__(self, max_size: int = 10000, ttl_hours: int = 24):
-        self._cache: Dict[str, dict] = {}
-        self.max_size = max_size
-        self.ttl = timedelta(hours=ttl_hours)
-    
-    def _generate_key(self, query: str, response: str) -> str:
-        content = f"{query.strip()}|{response.strip()}"
-        return hashlib.md5(content.encode()).hexdigest()
-    
-    def get(self, query: str, response: str) -> Optional[dict]:
-        key = self._generate_key(query, response)
-        
-        if key in self._cache:
-            entry = self._cache[key]
-            if datetime.utcnow() - entry["cached_at"] < self.ttl:
-                return entry["result"]
-            else:
-                del self._cache[key]
-        return None
-    
-    def set(self, query: str, response: str, result: dict):
-        key = self._generate_key(query, response)
-        
-        if len(self._cache) >= self.max_size:
-            oldest_key = min(self._cache.keys(), 
-                           key=lambda k: self._cache[k]["cached_at"])
-            del self._cache[oldest_key]
-        
-        self._cache[key] = {
-            "result": result,
-            "cached_at": datetime.utcnow()
-        }
-    
-    def stats(self) -> dict:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._counters = {"hits": 0, "misses": 0}
+
+    def make_key(self, query: str, response: str, context_texts: List[str]) -> str:
+        return evaluation_key(query, response, context_texts)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: List[str]) -> List[Optional[dict]]:
+        """Looks up many keys in one batched backend round trip."""
+        found = await self.backend.get_many(list(dict.fromkeys(keys)))
+        results = [found.get(k) for k in keys]
+        hits = sum(1 for r in results if r is not None)
+        self._counters["hits"] += hits
+        self._counters["misses"] += len(results) - hits
+        return results
+
+    async def set(self, key: str, result: dict):
+        await self.backend.set(key, result)
+
+    async def close(self):
+        await self.backend.close()
+
+    async def stats(self) -> dict:
+        lookups = self._counters["hits"] + self._counters["misses"]
         return {
-            "size": len(self._cache),
-            "max_size": self.max_size,
-            "usage_percent": (len(self._cache) / self.max_size) * 100
+            **await self.backend.stats(),
+            **self._counters,
+            "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
         }
 
-cache = EvaluationCache()
\ No newline at end of file
+def build_backend() -> CacheBackend:
+    ttl_seconds = settings.CACHE_TTL_HOURS * 3600
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteBackend(
+            settings.CACHE_SQLITE_PATH,
+            max_size=settings.CACHE_MAX_ENTRIES,
+            ttl_seconds=ttl_seconds,
+            max_bytes=settings.CACHE_MAX_BYTES,
+            sweep_interval_seconds=settings.CACHE_SWEEP_INTERVAL_SECONDS,
+            batch_size=settings.CACHE_BATCH_SIZE,
+        )
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.REDIS_URL, ttl_seconds=ttl_seconds, batch_size=settings.CACHE_BATCH_SIZE)
+    return MemoryBackend(
+        max_size=settings.CACHE_MAX_ENTRIES,
+        ttl_seconds=ttl_seconds,
+        max_bytes=settings.CACHE_MAX_BYTES,
+        sweep_interval_seconds=settings.CACHE_SWEEP_INTERVAL_SECONDS,
+    )
+
+cache = EvaluationCache(build_backend())
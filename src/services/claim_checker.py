@@ -0,0 +1,170 @@
+import re
+from typing import List, Optional
+from src.core.config import settings
+
+_PRICE = re.compile(r"(?:rs\.?|inr|₹|\$|usd)\s*(\d[\d,]*(?:\.\d+)?)|(\d[\d,]*(?:\.\d+)?)\s*(?:/-|rupees|inr|usd|dollars)", re.I)
+# A phone starts with "+" or an area code in parentheses, or is one long digit run (optionally one
+# unspaced hyphen). Spaced sequences such as the range "1400 - 2000" are numbers, not phones.
+_PHONE = re.compile(r"\+\d[\d\s().-]{7,}\d|\(\d{2,5}\)\s?\d[\d\s.-]{4,}\d|(?<!\d)\d{3,5}-?\d{5,8}(?!\d)")
+_URL = re.compile(r"https?://[^\s)\]>\"']+|www\.[^\s)\]>\"']+", re.I)
+_NUMBER = re.compile(r"(?<![\w.])\d[\d,]*(?:\.\d+)?(?![\w])")
+# Context and query numbers are indexed even when glued to words ("Room2000/-", "2000INR"): a value
+# missed there would turn a correct response claim into a false "not found".
+_ANY_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_ENTITY = re.compile(r"\b[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)+\b")
+_LEADING_WORDS = frozenset(
+    "a an and at but for from if in it of on our please so the then there these this to we what when "
+    "where which while with yes you your".split()
+)
+_TERM = re.compile(r"[a-z0-9]+")
+
+def _num(value: str) -> str:
+    value = value.replace(",", "")
+    return value[:-2] if value.endswith(".0") else value
+
+def _numbers(text: str) -> set:
+    return {_num(n) for n in _ANY_NUMBER.findall(text)}
+
+def _mentions(text: str, value: str) -> bool:
+    """Whole-token containment: "20" is not mentioned by "2025", "ivf" is not mentioned by "ivfs"."""
+    return re.search(r"(?<![a-z0-9])" + re.escape(value) + r"(?![a-z0-9])", text) is not None
+
+def _domain(url: str) -> str:
+    url = re.sub(r"^(?:https?://)?(?:www\.)?", "", url.lower())
+    return url.split("/")[0].rstrip(".,;:")
+
+class ClaimChecker:
+    """
+    Layer 1.5: checks the checkable claims of a response against the selected
+    context with precompiled patterns and set lookups.
+
+    Prices, phone numbers, URLs and other numbers are "hard" claims; named
+    entities are "soft" ones (reported, never decisive). Values the user
+    already wrote in the query are not treated as claims. Unsupported claims
+    are returned as flags for the LLM prompt. Settling is opt-in: when
+    enabled and enough hard claims are absent from the full context (not
+    just the selected excerpt), the item is settled as unfaithful without an
+    LLM call.
+    """
+    def __init__(self, min_unsupported: int = 2, max_supported_ratio: float = 0.34, enabled: bool = False):
+        self.min_unsupported = min_unsupported
+        self.max_supported_ratio = max_supported_ratio
+        self.enabled = enabled
+        self._counters = {"screened": 0, "settled": 0, "flagged": 0}
+
+    def _extract(self, text: str) -> List[tuple]:
+        claims = []
+        for m in _URL.finditer(text):
+            claims.append(("url", _domain(m.group())))
+        text_wo_urls = _URL.sub(" ", text)
+
+        consumed = set()
+        for m in _PRICE.finditer(text_wo_urls):
+            claims.append(("price", _num(m.group(1) or m.group(2))))
+            consumed.add(_num(m.group(1) or m.group(2)))
+        for m in _PHONE.finditer(text_wo_urls):
+            digits = re.sub(r"\D", "", m.group())
+            if len(digits) >= 8:
+                claims.append(("phone", digits[-8:]))
+        # Digit groups of a phone number are not claims of their own.
+        for m in _NUMBER.finditer(_PHONE.sub(" ", text_wo_urls)):
+            value = _num(m.group())
+            if len(value.replace(".", "")) >= 2 and value not in consumed:
+                claims.append(("number", value))
+        for m in _ENTITY.finditer(text_wo_urls):
+            words = m.group().split()
+            while words and words[0].lower() in _LEADING_WORDS:
+                words = words[1:]
+            if len(words) >= 2:
+                claims.append(("entity", " ".join(words).lower()))
+        return list(dict.fromkeys(claims))
+
+    def _context_index(self, context: List[str]) -> dict:
+        joined = "\n".join(context)
+        lowered = joined.lower()
+        return {
+            "text": re.sub(r"\s+", " ", lowered),
+            "numbers": _numbers(_URL.sub(" ", joined)),
+            "phones": {re.sub(r"\D", "", p)[-8:] for p in _PHONE.findall(joined)},
+            "domains": {_domain(u) for u in _URL.findall(joined)},
+        }
+
+    def _supported(self, kind: str, value: str, index: dict) -> bool:
+        if kind in ("price", "number"):
+            return value in index["numbers"]
+        if kind == "phone":
+            return value in index["phones"]
+        if kind == "url":
+            return value in index["domains"] or value in index["text"]
+        return value in index["text"]
+
+    def _in_query(self, kind: str, value: str, query: str, query_lower: str) -> bool:
+        if kind in ("price", "number"):
+            return value in _numbers(query)
+        if kind == "phone":
+            return value in {re.sub(r"\D", "", p)[-8:] for p in _PHONE.findall(query)}
+        return _mentions(query_lower, value)
+
+    def _settles(self, hard: list) -> bool:
+        unsupported = [c for c in hard if not c["supported"]]
+        return len(unsupported) >= self.min_unsupported and 1 - len(unsupported) / len(hard) <= self.max_supported_ratio
+
+    def check(self, query: str, response: str, context: List[str], full_context: Optional[List[str]] = None) -> dict:
+        """
+        Returns {"claims", "flags", "verdict"}; verdict is None unless settling is enabled and the screen is
+        confident. Flags are checked against `context` (what the LLM will see); a verdict also requires the
+        claims to be missing from `full_context` when that is given.
+        """
+        self._counters["screened"] += 1
+        index = self._context_index(context)
+        query_lower = query.lower()
+
+        claims = []
+        for kind, value in self._extract(response):
+            if self._in_query(kind, value, query, query_lower):
+                continue
+            claims.append({"kind": kind, "value": value, "supported": self._supported(kind, value, index)})
+
+        flags = [f"{c['kind']} '{c['value']}' not found in context" for c in claims if not c["supported"]]
+        hard = [c for c in claims if c["kind"] != "entity"]
+
+        verdict = None
+        if self.enabled and hard and self._settles(hard):
+            if full_context is not None:
+                full_index = self._context_index(full_context)
+                hard = [{**c, "supported": self._supported(c["kind"], c["value"], full_index)} for c in hard]
+            if self._settles(hard):
+                missing = [f"{c['kind']} '{c['value']}' not found in context" for c in hard if not c["supported"]]
+                verdict = {
+                    "relevance_score": self._relevance(query, response),
+                    "faithfulness_score": round(1 - len(missing) / len(hard), 2),
+                    "reasoning": "Layer 1.5 Violation: unsupported claims - " + "; ".join(missing[:5]),
+                }
+
+        if verdict:
+            self._counters["settled"] += 1
+        elif flags:
+            self._counters["flagged"] += 1
+        return {"claims": claims, "flags": flags, "verdict": verdict}
+
+    def _relevance(self, query: str, response: str) -> float:
+        """Share of the query's content words the response addresses (heuristic, floor 0.5)."""
+        query_terms = {t for t in _TERM.findall(query.lower()) if len(t) > 3}
+        if not query_terms:
+            return 0.5
+        overlap = len(query_terms & set(_TERM.findall(response.lower()))) / len(query_terms)
+        return round(max(0.5, min(1.0, overlap)), 2)
+
+    def stats(self) -> dict:
+        c = self._counters
+        return {
+            **c,
+            "settle_rate": round(c["settled"] / c["screened"], 4) if c["screened"] else 0.0,
+            "flag_rate": round(c["flagged"] / c["screened"], 4) if c["screened"] else 0.0,
+        }
+
+claim_checker = ClaimChecker(
+    min_unsupported=settings.SCREEN_MIN_UNSUPPORTED,
+    max_supported_ratio=settings.SCREEN_MAX_SUPPORTED_RATIO,
+    enabled=settings.SCREEN_SETTLE_ENABLED,
+)
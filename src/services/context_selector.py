@@ -0,0 +1,105 @@
+import re
+import numpy as np
+from collections import Counter
+from typing import List, Optional
+from src.core.config import settings
+from src.utils.metrics import estimate_tokens
+
+_TERM = re.compile(r"[a-z0-9]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i if in is it its me my "
+    "of on or our so that the their them there these they this to was we were what when where "
+    "which who will with you your".split()
+)
+
+def _terms(text: str) -> List[str]:
+    return [t for t in _TERM.findall(text.lower()) if t not in _STOPWORDS]
+
+class ContextSelector:
+    """
+    Ranks retrieval chunks against the query and the response with BM25 and
+    packs the best ones into a token budget.
+
+    The response carries the claims the auditor must verify, so its terms
+    weigh more than the query's. Scoring only needs the columns for those
+    terms, so the term-frequency matrix is (chunks x query/response terms)
+    and the whole BM25 pass is a handful of NumPy array operations.
+    """
+    def __init__(self, token_budget: int = 1500, max_chunks: int = 5, query_weight: float = 0.5,
+                 k1: float = 1.5, b: float = 0.75):
+        self.token_budget = token_budget
+        self.max_chunks = max_chunks
+        self.query_weight = query_weight
+        self.k1 = k1
+        self.b = b
+
+    def score(self, query: str, response: str, chunks: List[str]) -> np.ndarray:
+        weights = Counter()
+        for term in _terms(response):
+            weights[term] = 1.0
+        for term in _terms(query):
+            weights[term] = max(weights[term], self.query_weight)
+        if not weights or not chunks:
+            return np.zeros(len(chunks))
+
+        vocab = {term: j for j, term in enumerate(weights)}
+        tf = np.zeros((len(chunks), len(vocab)), dtype=np.float32)
+        doc_len = np.zeros(len(chunks), dtype=np.float32)
+        for i, chunk in enumerate(chunks):
+            terms = _terms(chunk)
+            doc_len[i] = len(terms)
+            for term, count in Counter(terms).items():
+                j = vocab.get(term)
+                if j is not None:
+                    tf[i, j] = count
+
+        n_docs = len(chunks)
+        df = (tf > 0).sum(axis=0)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * doc_len / max(doc_len.mean(), 1.0))
+        bm25 = tf * (self.k1 + 1) / (tf + norm[:, None])
+        term_weights = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+        return bm25 @ (idf * term_weights)
+
+    def _trim(self, text: str, max_tokens: int) -> str:
+        """Cuts `text` at the last sentence boundary that fits in `max_tokens` (hard cut if none does)."""
+        kept, used = [], 0
+        for sentence in _SENTENCE_END.split(text):
+            cost = estimate_tokens(sentence)
+            if used + cost > max_tokens:
+                break
+            kept.append(sentence)
+            used += cost
+        return " ".join(kept) if kept else text[:max_tokens * 4]
+
+    def select(self, query: str, response: str, chunks: List[str],
+               chunk_tokens: Optional[List[Optional[int]]] = None) -> List[str]:
+        if not chunks:
+            return []
+        scores = self.score(query, response, chunks)
+        order = np.argsort(-scores, kind="stable")
+
+        selected, remaining = [], self.token_budget
+        for i in order:
+            if len(selected) >= self.max_chunks or remaining <= 0:
+                break
+            # Unrelated chunks only pad the prompt; keep them out once something relevant is in.
+            if scores[i] <= 0 and selected:
+                break
+            text = chunks[i]
+            tokens = chunk_tokens[i] if chunk_tokens and i < len(chunk_tokens) and chunk_tokens[i] else estimate_tokens(text)
+            if tokens > remaining:
+                # A few words of a chunk rarely support anything; leave room for a smaller chunk instead.
+                if remaining < 64:
+                    continue
+                text = self._trim(text, remaining)
+                tokens = estimate_tokens(text)
+            selected.append(text)
+            remaining -= tokens
+        return selected
+
+context_selector = ContextSelector(
+    token_budget=settings.CONTEXT_TOKEN_BUDGET,
+    max_chunks=settings.CONTEXT_MAX_CHUNKS,
+)
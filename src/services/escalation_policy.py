@@ -0,0 +1,150 @@
+import time
+import random
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+from src.core.config import settings
+from src.services.results_store import results_store
+
+class EscalationPolicy(ABC):
+    """Decides whether a Tier 1 verdict is sent to the Tier 3 judge, and tracks what that costs."""
+
+    def __init__(self):
+        self._counters = {"decisions": 0, "escalations": 0}
+        self._cost = {"tier1_only": 0.0, "escalated": 0.0}
+
+    @abstractmethod
+    def _decide(self, content: dict) -> bool:
+        ...
+
+    def should_escalate(self, content: dict) -> bool:
+        escalate = self._decide(content)
+        self._counters["decisions"] += 1
+        self._counters["escalations"] += escalate
+        return escalate
+
+    def record(self, tier1: dict, tier3: dict = None, cost: float = 0.0):
+        """Called once per LLM-judged item with its final cost (and the Tier 3 verdict if escalated)."""
+        self._cost["escalated" if tier3 else "tier1_only"] += cost
+        if tier3:
+            results_store.record_escalation(tier1, tier3)
+
+    def stats(self) -> dict:
+        decisions, escalations = self._counters["decisions"], self._counters["escalations"]
+        rate = escalations / decisions if decisions else 0.0
+        mean_tier1 = self._cost["tier1_only"] / (decisions - escalations) if decisions > escalations else 0.0
+        mean_escalated = self._cost["escalated"] / escalations if escalations else 0.0
+        return {
+            "policy": type(self).__name__,
+            **self._counters,
+            "escalation_rate": round(rate, 4),
+            "mean_cost_tier1_only_usd": round(mean_tier1, 8),
+            "mean_cost_escalated_usd": round(mean_escalated, 8),
+            "expected_cost_per_1k_usd": round(1000 * ((1 - rate) * mean_tier1 + rate * mean_escalated), 6),
+        }
+
+
+class ThresholdPolicy(EscalationPolicy):
+    """The original rule: escalate whenever either score is below `threshold`."""
+
+    def __init__(self, threshold: float = 0.9):
+        super().__init__()
+        self.threshold = threshold
+
+    def _decide(self, content: dict) -> bool:
+        return content.get("relevance_score", 0) < self.threshold or content.get("faithfulness_score", 0) < self.threshold
+
+
+class BandPolicy(EscalationPolicy):
+    """
+    Escalates only uncertain verdicts: a score inside [low, high) for either
+    relevance or faithfulness. A clear fail below `low` is kept as-is, because
+    the Tier 3 judge almost always agrees with it. `explore_rate` still sends a
+    small sample of confident verdicts up, so calibration data keeps covering
+    the whole score range.
+    """
+    def __init__(self, low: float = 0.3, high: float = 0.9, explore_rate: float = 0.0):
+        super().__init__()
+        self.low = low
+        self.high = high
+        self.explore_rate = explore_rate
+
+    def _uncertain(self, content: dict) -> bool:
+        scores = (content.get("relevance_score", 0), content.get("faithfulness_score", 0))
+        return any(self.low <= score < self.high for score in scores)
+
+    def _decide(self, content: dict) -> bool:
+        if self._uncertain(content):
+            return True
+        return random.random() < self.explore_rate
+
+
+class CalibratedPolicy(BandPolicy):
+    """
+    BandPolicy whose uncertain band is trimmed by observed Tier 1 / Tier 3
+    agreement. Any 0.1-wide bucket of the Tier 1 min score where the judges
+    agreed at least `target_agreement` of the time (over `min_samples` or
+    more escalations) stops escalating. Calibration is re-read from the
+    results store every `refresh_seconds`, in a worker thread when called
+    from the event loop.
+    """
+    def __init__(self, low: float = 0.3, high: float = 0.9, explore_rate: float = 0.05,
+                 target_agreement: float = 0.9, min_samples: int = 30, tolerance: float = 0.2,
+                 refresh_seconds: float = 300):
+        super().__init__(low, high, explore_rate)
+        self.target_agreement = target_agreement
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self.refresh_seconds = refresh_seconds
+        self._trusted_buckets = set()
+        self._next_refresh = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+
+    def refresh(self):
+        self._trusted_buckets = {
+            row["bucket"] for row in results_store.agreement_by_bucket(self.tolerance)
+            if row["samples"] >= self.min_samples and row["agreement"] >= self.target_agreement
+        }
+        self._next_refresh = time.monotonic() + self.refresh_seconds
+
+    def _refresh_safely(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"[Escalation] Calibration refresh failed: {e}")
+            self._next_refresh = time.monotonic() + self.refresh_seconds
+
+    def _decide(self, content: dict) -> bool:
+        if time.monotonic() >= self._next_refresh and not (self._refreshing and not self._refreshing.done()):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._refresh_safely()
+            else:
+                # Decides with the previous buckets until the new ones are read.
+                self._refreshing = loop.create_task(asyncio.to_thread(self._refresh_safely))
+
+        if self._uncertain(content):
+            bucket = min(int(min(content.get("relevance_score", 0), content.get("faithfulness_score", 0)) * 10), 9)
+            if bucket not in self._trusted_buckets:
+                return True
+        return random.random() < self.explore_rate
+
+    def stats(self) -> dict:
+        return {**super().stats(), "trusted_buckets": sorted(self._trusted_buckets)}
+
+
+def build_policy() -> EscalationPolicy:
+    if settings.ESCALATION_POLICY == "threshold":
+        return ThresholdPolicy(settings.ESCALATION_BAND_HIGH)
+    if settings.ESCALATION_POLICY == "calibrated":
+        return CalibratedPolicy(
+            settings.ESCALATION_BAND_LOW,
+            settings.ESCALATION_BAND_HIGH,
+            explore_rate=settings.ESCALATION_EXPLORE_RATE,
+            target_agreement=settings.CALIBRATION_TARGET_AGREEMENT,
+            min_samples=settings.CALIBRATION_MIN_SAMPLES,
+        )
+    return BandPolicy(settings.ESCALATION_BAND_LOW, settings.ESCALATION_BAND_HIGH, settings.ESCALATION_EXPLORE_RATE)
+
+escalation_policy = build_policy()
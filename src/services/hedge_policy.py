@@ -0,0 +1,127 @@
+import re
+import time
+from collections import deque
+from typing import Optional
+import numpy as np
+from src.core.config import settings
+from src.services.rate_scheduler import TokenBucket, request_priority, PRIORITY_BACKGROUND
+from src.utils.instrumentation import LLM_PATH_SECONDS
+
+_DOMAINS = {
+    "medical": re.compile(
+        r"\b(doctor|medic\w*|symptom\w*|dose|dosage|prescri\w*|treatment\w*|diagnos\w*|pain|pregnan\w*|"
+        r"surgery|clinic\w*|hospital\w*|drug\w*|ivf|fertility|embryo\w*|side effects?)\b", re.IGNORECASE),
+    "legal": re.compile(
+        r"\b(law|laws|lawyer\w*|legal\w*|court\w*|contract\w*|visa\w*|liabilit\w*|sue|lawsuit\w*|"
+        r"attorney\w*|consent|rights)\b", re.IGNORECASE),
+}
+
+class HedgePolicy:
+    """
+    Decides when Layer 3 is started alongside Layer 2 instead of after it.
+
+    The predictor is the observed escalation rate of similar items, grouped by
+    query domain, whether the claim screen flagged anything and how much
+    context the auditor sees; groups with few observations lean on the global
+    rate. A hedge that turns out unneeded is cancelled, and the tokens it
+    burned are charged to a per-minute waste budget that caps the extra spend.
+    """
+    def __init__(self, threshold: float = 0.5, max_wasted_tokens_per_minute: float = 2000,
+                 prior_strength: float = 20):
+        self.threshold = threshold
+        self.prior_strength = prior_strength
+        self.budget = TokenBucket(max_wasted_tokens_per_minute, burst_seconds=60)
+        self._groups = {}  # features -> [decisions, escalations]
+        self._seen = [0, 0]
+        self._counters = {
+            "predictions": 0, "hedged": 0, "wins": 0, "wasted": 0, "missed": 0,
+            "skipped_budget": 0, "skipped_busy": 0,
+            "wasted_tokens": 0.0, "wasted_cost_usd": 0.0, "head_start_seconds": 0.0,
+        }
+        self._latency = {mode: deque(maxlen=2000) for mode in ("off", "hedged", "not_hedged")}
+
+    def features(self, user_query: str, safe_context: list, flags: list) -> tuple:
+        domain = next((name for name, pattern in _DOMAINS.items() if pattern.search(user_query)), "general")
+        context_chars = sum(len(text) for text in safe_context)
+        # ~4 characters per token; "short" is under half the context budget.
+        size = "none" if not context_chars else "short" if context_chars < settings.CONTEXT_TOKEN_BUDGET * 2 else "long"
+        return domain, bool(flags), size
+
+    def predict(self, features: tuple) -> float:
+        """Smoothed escalation rate of the feature group. The global prior starts low: most items stay at Layer 2."""
+        decisions, escalations = self._groups.get(features, (0, 0))
+        prior = (self._seen[1] + 1) / (self._seen[0] + 4)
+        return (escalations + self.prior_strength * prior) / (decisions + self.prior_strength)
+
+    def should_hedge(self, features: tuple, estimated_tokens: float, judge_busy: bool = False) -> bool:
+        # Background work (job queue, bulk audits) is not waiting on a reply and never hedges.
+        if request_priority.get() >= PRIORITY_BACKGROUND:
+            return False
+        self._counters["predictions"] += 1
+        if self.predict(features) < self.threshold:
+            return False
+        # A backed-up judge would only queue the hedge behind calls that are certainly needed.
+        if judge_busy:
+            self._counters["skipped_busy"] += 1
+            return False
+        now = time.monotonic()
+        if self.budget.wait_time(estimated_tokens, now) > 0:
+            self._counters["skipped_budget"] += 1
+            return False
+        # Reserved up front so concurrent hedges cannot overdraw the budget; refunded on a win.
+        self.budget.take(estimated_tokens, now)
+        self._counters["hedged"] += 1
+        return True
+
+    def record(self, features: Optional[tuple], escalated: bool, hedged: bool, seconds: float,
+               reserved_tokens: float = 0.0, wasted: tuple = (0, 0), head_start: float = 0.0):
+        """Called once per single-item LLM evaluation; `features` is None when hedging is disabled."""
+        mode = "off" if features is None else "hedged" if hedged else "not_hedged"
+        self._latency[mode].append(seconds)
+        LLM_PATH_SECONDS.observe(seconds, mode)
+        if features is None:
+            return
+
+        group = self._groups.setdefault(features, [0, 0])
+        group[0] += 1
+        group[1] += escalated
+        self._seen[0] += 1
+        self._seen[1] += escalated
+
+        now = time.monotonic()
+        if hedged and escalated:
+            self._counters["wins"] += 1
+            self._counters["head_start_seconds"] += head_start
+            self.budget.take(-reserved_tokens, now)
+        elif hedged:
+            input_tokens, output_tokens = wasted
+            self._counters["wasted"] += 1
+            self._counters["wasted_tokens"] += input_tokens + output_tokens
+            self._counters["wasted_cost_usd"] += (input_tokens * settings.INPUT_COST_PER_1K
+                                                  + output_tokens * settings.OUTPUT_COST_PER_1K) / 1000
+            self.budget.take(input_tokens + output_tokens - reserved_tokens, now)
+        elif escalated:
+            self._counters["missed"] += 1
+
+    def stats(self) -> dict:
+        c = self._counters
+        settled = c["wins"] + c["wasted"]
+        latency = {}
+        for mode, values in self._latency.items():
+            if values:
+                p50, p99 = np.percentile(np.asarray(values), [50, 99])
+                latency[mode] = {"count": len(values), "p50_ms": round(p50 * 1000, 2), "p99_ms": round(p99 * 1000, 2)}
+        return {
+            "enabled": settings.HEDGING_ENABLED,
+            **{k: round(v, 6) if isinstance(v, float) else v for k, v in c.items()},
+            "win_rate": round(c["wins"] / settled, 4) if settled else 0.0,
+            "escalations_hedged": round(c["wins"] / (c["wins"] + c["missed"]), 4) if c["wins"] + c["missed"] else 0.0,
+            "waste_budget_tokens": None if self.budget.unlimited else round(self.budget.level, 1),
+            "latency": latency,
+        }
+
+hedge_policy = HedgePolicy(
+    settings.HEDGE_THRESHOLD,
+    settings.HEDGE_MAX_WASTED_TOKENS_PER_MINUTE,
+    settings.HEDGE_PRIOR_STRENGTH,
+)
@@ -0,0 +1,212 @@
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from typing import Awaitable, Callable, Optional
+from src.core.config import settings
+
+class QueueFullError(Exception):
+    pass
+
+class JobQueue:
+    """
+    Durable background evaluation queue backed by SQLite.
+
+    Jobs survive restarts, every uvicorn worker on the host can share the
+    same file, and claims are atomic so a job runs on one worker at a time.
+    A job left 'running' longer than `lease_seconds` (its process died) is
+    claimed again. Failed jobs are retried with exponential backoff and
+    dead-lettered after `max_attempts`.
+
+    The file is opened on first use (normally at startup), not at import.
+    Queries run in worker threads, so waiting on another worker's write lock
+    never blocks the event loop.
+    """
+    def __init__(self, path: str, workers: int = 4, max_depth: int = 1000,
+                 max_attempts: int = 3, retry_base_seconds: float = 2, lease_seconds: float = 300,
+                 poll_seconds: float = 1):
+        self.path = path
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._tasks = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        """The connection, opened on first use. Callers hold `_lock`."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL, result TEXT, error TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "available_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, available_at)")
+            self._conn = conn
+        return self._conn
+
+    def _open(self):
+        with self._lock:
+            self._db()
+
+    def _close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _depth(self) -> int:
+        with self._lock:
+            return self._db().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    def _insert(self, payload: dict) -> str:
+        if self._depth() >= self.max_depth:
+            raise QueueFullError(f"Evaluation queue is full ({self.max_depth} pending jobs).")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO jobs (id, status, payload, created_at, updated_at, available_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, json.dumps(payload, default=str), now, now, now),
+            )
+        return job_id
+
+    def _get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT id, status, attempts, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _counts(self) -> dict:
+        with self._lock:
+            rows = self._db().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    async def depth(self) -> int:
+        return await asyncio.to_thread(self._depth)
+
+    async def enqueue(self, payload: dict) -> str:
+        job_id = await asyncio.to_thread(self._insert, payload)
+        if self._wakeup:
+            self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def stats(self) -> dict:
+        return {"workers": self.workers, "max_depth": self.max_depth, **await asyncio.to_thread(self._counts)}
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, payload, attempts FROM jobs "
+                    "WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND updated_at <= ?) "
+                    "ORDER BY available_at LIMIT 1",
+                    (now, now - self.lease_seconds),
+                ).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (now, row["id"]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _complete(self, job_id: str, result: dict):
+        with self._lock:
+            self._db().execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result, default=str), time.time(), job_id),
+            )
+
+    def _fail(self, job_id: str, attempts: int, error: str):
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            if attempts >= self.max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = 'dead', error = ?, updated_at = ? WHERE id = ?",
+                    (error, now, job_id),
+                )
+            else:
+                retry_at = now + self.retry_base_seconds * (2 ** (attempts - 1))
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, updated_at = ?, available_at = ? WHERE id = ?",
+                    (error, now, retry_at, job_id),
+                )
+
+    async def _worker(self, handler: Callable[[dict], Awaitable[dict]]):
+        while True:
+            try:
+                row = await asyncio.to_thread(self._claim)
+            except sqlite3.Error as e:
+                # e.g. another worker held the write lock past the timeout; try again on the next poll.
+                print(f"[Job Queue] Claim failed: {e}")
+                row = None
+            if row is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            attempts = row["attempts"] + 1
+            try:
+                result = await handler(json.loads(row["payload"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Job Queue] Job {row['id']} attempt {attempts} failed: {e}")
+                await asyncio.to_thread(self._fail, row["id"], attempts, str(e))
+            else:
+                await asyncio.to_thread(self._complete, row["id"], result)
+
+    async def start(self, handler: Callable[[dict], Awaitable[dict]]):
+        await asyncio.to_thread(self._open)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(handler)) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self._close)
+
+job_queue = JobQueue(
+    settings.JOB_QUEUE_PATH,
+    workers=settings.JOB_WORKERS,
+    max_depth=settings.JOB_MAX_DEPTH,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+)
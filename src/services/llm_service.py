@@ -1,33 +1,144 @@
 import json
-from groq import Groq
-from tenacity import retry, stop_after_attempt, wait_exponential
+import asyncio
+from typing import Callable, Optional
+import httpx
+from groq import AsyncGroq, RateLimitError
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 from src.core.config import settings
+from src.services.rate_scheduler import rate_scheduler, parse_retry_after, SchedulerOverloadedError
+from src.utils.metrics import estimate_tokens
+from src.utils.instrumentation import timed, LLM_REQUESTS, LLM_TOKENS, LLM_COST, LLM_IN_FLIGHT
 
-client = Groq(api_key=settings.GROQ_API_KEY)
+# One pooled HTTP connection set shared by every evaluation in this worker.
+http_client = httpx.AsyncClient(
+    timeout=settings.LLM_TIMEOUT_SECONDS,
+    limits=httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+    ),
+)
+
+# Retries are owned by tenacity below, so the SDK's own retry loop is disabled.
+client = AsyncGroq(
+    api_key=settings.GROQ_API_KEY,
+    base_url=settings.GROQ_BASE_URL,
+    max_retries=0,
+    http_client=http_client,
+)
+
+SYSTEM_PROMPT = "You are a strict QA Auditor. Output ONLY valid JSON."
+
+_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+def _retry_wait(retry_state) -> float:
+    # After a 429 the scheduler already holds the model until Retry-After; no extra sleep here.
+    if isinstance(retry_state.outcome.exception(), RateLimitError):
+        return 0
+    return _backoff(retry_state)
 
 class GroqClient:
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def get_json_response(self, prompt: str, model_id: str) -> dict:
+    def __init__(self):
+        self._limits = {
+            settings.MODEL_TIER_1: settings.LLM_CONCURRENCY_TIER_1,
+            settings.MODEL_TIER_3: settings.LLM_CONCURRENCY_TIER_3,
+        }
+        self._semaphores = {}
+        self._in_flight = {}
+
+    def _semaphore(self, model_id: str) -> asyncio.Semaphore:
+        if model_id not in self._semaphores:
+            limit = self._limits.get(model_id, settings.LLM_CONCURRENCY_TIER_1)
+            self._semaphores[model_id] = asyncio.Semaphore(limit)
+        return self._semaphores[model_id]
+
+    def saturated(self, model_id: str) -> bool:
+        """True when a new call to `model_id` would have to wait for a slot or for rate-limit room."""
+        return self._semaphore(model_id).locked() or rate_scheduler.for_model(model_id).waiting > 0
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": dict(self._in_flight),
+            "concurrency_limits": dict(self._limits),
+            "rate_scheduler": rate_scheduler.stats(),
+        }
+
+    # A cancelled call (e.g. an unneeded hedge) must stay cancelled, not be retried.
+    @retry(stop=stop_after_attempt(settings.LLM_MAX_RETRIES), wait=_retry_wait,
+           retry=retry_if_not_exception_type((SchedulerOverloadedError, asyncio.CancelledError)))
+    async def get_json_response(self, prompt: str, model_id: str,
+                                on_dispatch: Optional[Callable[[], None]] = None) -> dict:
+        """`on_dispatch` is called once the request has left the scheduler and is being sent to the provider."""
+        # Provider budgets first: a call waiting for rate-limit room must not hold a concurrency slot.
+        scheduler = rate_scheduler.for_model(model_id)
+        input_estimate = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt)
+        estimated = input_estimate + settings.LLM_EXPECTED_OUTPUT_TOKENS
+        await scheduler.acquire(estimated)
+
+        # The reservation is corrected by the billed usage on success; a 429 keeps it (the model is
+        # paused anyway). A call cancelled after it was sent is counted at its input estimate, the
+        # same upper bound its caller is charged. Any other error, or a cancellation before
+        # sending, returns it to the budget.
+        settled, dispatched = False, False
         try:
-            completion = client.chat.completions.create(
-                model=model_id,
-                messages=[
-                    {"role": "system", "content": "You are a strict QA Auditor. Output ONLY valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0,
-                response_format={"type": "json_object"}
-            )
-            
-            content = json.loads(completion.choices[0].message.content)
-            
-            usage = completion.usage
-            return {
-                "content": content,
-                "input_tokens": usage.prompt_tokens,
-                "output_tokens": usage.completion_tokens,
-                "model_used": model_id
-            }
-        except Exception as e:
-            print(f"Groq API Error ({model_id}): {e}")
-            raise e
\ No newline at end of file
+            # The slot is taken per attempt, so a request sleeping in backoff does not hold it.
+            async with self._semaphore(model_id):
+                self._in_flight[model_id] = self._in_flight.get(model_id, 0) + 1
+                LLM_IN_FLIGHT.inc(model_id)
+                try:
+                    dispatched = True
+                    if on_dispatch is not None:
+                        on_dispatch()
+                    raw = await client.chat.completions.with_raw_response.create(
+                        model=model_id,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0,
+                        response_format={"type": "json_object"}
+                    )
+                    completion = await raw.parse()
+                    # Billed even if the body turns out not to be valid JSON.
+                    usage = completion.usage
+                    scheduler.settle(estimated, usage.prompt_tokens + usage.completion_tokens, raw.headers)
+                    settled = True
+
+                    with timed("parse"):
+                        content = json.loads(completion.choices[0].message.content)
+
+                    LLM_REQUESTS.inc(model_id, "ok")
+                    LLM_TOKENS.inc(model_id, "input", amount=usage.prompt_tokens)
+                    LLM_TOKENS.inc(model_id, "output", amount=usage.completion_tokens)
+                    LLM_COST.inc(model_id, amount=(usage.prompt_tokens * settings.INPUT_COST_PER_1K
+                                                   + usage.completion_tokens * settings.OUTPUT_COST_PER_1K) / 1000)
+                    return {
+                        "content": content,
+                        "input_tokens": usage.prompt_tokens,
+                        "output_tokens": usage.completion_tokens,
+                        "model_used": model_id
+                    }
+                except RateLimitError as e:
+                    LLM_REQUESTS.inc(model_id, "rate_limited")
+                    scheduler.penalize(parse_retry_after(e.response.headers.get("retry-after")))
+                    settled = True
+                    print(f"Groq rate limit ({model_id}): {e}")
+                    raise e
+                except Exception as e:
+                    LLM_REQUESTS.inc(model_id, "error")
+                    print(f"Groq API Error ({model_id}): {e}")
+                    raise e
+                finally:
+                    self._in_flight[model_id] -= 1
+                    LLM_IN_FLIGHT.dec(model_id)
+        except asyncio.CancelledError:
+            if not settled and dispatched:
+                scheduler.settle(estimated, input_estimate)
+                settled = True
+            raise
+        finally:
+            if not settled:
+                scheduler.release(estimated)
+
+
+async def close_client():
+    await http_client.aclose()
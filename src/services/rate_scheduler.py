@@ -0,0 +1,226 @@
+import time
+import heapq
+import asyncio
+import itertools
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from src.core.config import settings
+
+# Lower runs first. The priority travels with the request's context, so it
+# reaches the LLM client without being threaded through every call.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+request_priority: ContextVar[int] = ContextVar("request_priority", default=PRIORITY_BATCH)
+
+class SchedulerOverloadedError(Exception):
+    """Raised when a model's wait queue is full and this request was shed."""
+
+    def __init__(self, message: str, retry_after: float = 5.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Refills continuously at `rate` units/second up to `capacity`. A rate of 0 means unlimited."""
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (a request larger than the bucket waits for a full one)."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float, now: float):
+        if not self.unlimited:
+            self._refill(now)
+            self.level -= amount
+
+    def clamp(self, remaining: float, now: float):
+        """Aligns the local estimate with the provider's own remaining count."""
+        if not self.unlimited:
+            self._refill(now)
+            self.level = min(self.level, remaining)
+
+
+class ModelScheduler:
+    """
+    Request and token budgets for one model. Callers wait in a priority queue
+    and are released in order as the budgets refill; a 429's Retry-After
+    pauses the whole model. When the queue is full the lowest-priority waiter
+    is shed.
+    """
+    def __init__(self, model_id: str, rpm: float, tpm: float, burst_seconds: float = 10, max_queue: int = 200):
+        self.model_id = model_id
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds)
+        self.max_queue = max_queue
+        self.blocked_until = 0.0
+        self._waiters = []  # heap of (priority, seq, tokens, future)
+        self._seq = itertools.count()
+        self._pump_task = None
+        self._counters = {"granted": 0, "queued": 0, "shed": 0, "rate_limited": 0, "released": 0,
+                          "wait_seconds": 0.0}
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def max_call_tokens(self) -> Optional[float]:
+        """Largest single call the token budget can ever admit (one minute of it); None when unlimited."""
+        return None if self.tokens.unlimited else self.tokens.rate * 60
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        return max(self.blocked_until - now, self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    def _grant(self, tokens: float, now: float):
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+        self._counters["granted"] += 1
+
+    async def acquire(self, tokens: float, priority: Optional[int] = None):
+        priority = request_priority.get() if priority is None else priority
+        now = time.monotonic()
+        if not self._waiters and self._wait_time(tokens, now) <= 0:
+            self._grant(tokens, now)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            worst = max(self._waiters)
+            if worst[0] <= priority:
+                self._counters["shed"] += 1
+                raise SchedulerOverloadedError(f"{self.model_id} queue is full ({self.max_queue} waiting).",
+                                               retry_after=self._wait_time(tokens, now) + 1)
+            self._waiters.remove(worst)
+            heapq.heapify(self._waiters)
+            self._counters["shed"] += 1
+            if not worst[3].done():
+                worst[3].set_exception(SchedulerOverloadedError(f"{self.model_id} shed for higher-priority work."))
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self._counters["queued"] += 1
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A caller that gave up must not keep its place (or its budget) in the queue.
+            if not future.done() or future.cancelled():
+                self._waiters = [w for w in self._waiters if w[3] is not future]
+                heapq.heapify(self._waiters)
+            elif future.exception() is None:
+                # Granted in the same tick it was cancelled: nothing was sent.
+                self.release(tokens)
+            raise
+        self._counters["wait_seconds"] += time.monotonic() - now
+
+    async def _pump(self):
+        while self._waiters:
+            priority, seq, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            now = time.monotonic()
+            delay = self._wait_time(tokens, now)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            heapq.heappop(self._waiters)
+            self._grant(tokens, now)
+            future.set_result(None)
+
+    def release(self, tokens: float):
+        """Returns the tokens reserved by a granted call that ended without billed usage to settle."""
+        self._counters["released"] += 1
+        if not self.tokens.unlimited:
+            self.tokens.take(-tokens, time.monotonic())
+            self.tokens.level = min(self.tokens.level, self.tokens.capacity)
+
+    def settle(self, estimated: float, actual: float, headers=None):
+        """Corrects the token bucket with the billed usage and the provider's remaining-budget headers."""
+        now = time.monotonic()
+        self.tokens.take(actual - estimated, now)
+        if headers:
+            remaining_requests = headers.get("x-ratelimit-remaining-requests")
+            remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+            if remaining_requests and remaining_requests.isdigit():
+                self.requests.clamp(float(remaining_requests), now)
+            if remaining_tokens and remaining_tokens.isdigit():
+                self.tokens.clamp(float(remaining_tokens), now)
+
+    def penalize(self, retry_after: Optional[float]):
+        """A 429 pauses every caller of this model until Retry-After has passed."""
+        self._counters["rate_limited"] += 1
+        pause = retry_after if retry_after is not None else settings.SCHEDULER_DEFAULT_BACKOFF_SECONDS
+        self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            **{k: round(v, 4) if isinstance(v, float) else v for k, v in self._counters.items()},
+            "waiting": len(self._waiters),
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - now), 3),
+            "request_budget": None if self.requests.unlimited else round(self.requests.level, 2),
+            "token_budget": None if self.tokens.unlimited else round(self.tokens.level, 1),
+        }
+
+
+class RateScheduler:
+    def __init__(self, limits: dict, burst_seconds: float = 10, max_queue: int = 200, headroom: float = 0.9):
+        """`limits` maps model id -> (requests per minute, tokens per minute); 0 disables a budget."""
+        self._models = {
+            model_id: ModelScheduler(model_id, rpm * headroom, tpm * headroom, burst_seconds, max_queue)
+            for model_id, (rpm, tpm) in limits.items()
+        }
+        self._default = (0, 0, burst_seconds, max_queue)
+
+    def for_model(self, model_id: str) -> ModelScheduler:
+        if model_id not in self._models:
+            rpm, tpm, burst_seconds, max_queue = self._default
+            self._models[model_id] = ModelScheduler(model_id, rpm, tpm, burst_seconds, max_queue)
+        return self._models[model_id]
+
+    def stats(self) -> dict:
+        return {model_id: scheduler.stats() for model_id, scheduler in self._models.items()}
+
+rate_scheduler = RateScheduler(
+    {
+        settings.MODEL_TIER_1: (settings.LLM_RPM_TIER_1, settings.LLM_TPM_TIER_1),
+        settings.MODEL_TIER_3: (settings.LLM_RPM_TIER_3, settings.LLM_TPM_TIER_3),
+    },
+    burst_seconds=settings.SCHEDULER_BURST_SECONDS,
+    max_queue=settings.SCHEDULER_MAX_QUEUE,
+    headroom=settings.SCHEDULER_HEADROOM,
+)
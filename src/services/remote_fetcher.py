@@ -0,0 +1,139 @@
+import json
+import time
+import asyncio
+import httpx
+from collections import OrderedDict
+from src.core.config import settings
+
+class RemoteFetchError(Exception):
+    """A remote document could not be fetched or parsed; `status_code` is the HTTP status to report."""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RemoteFetcher:
+    """
+    Fetches remote JSON documents over one long-lived connection pool and
+    keeps the parsed documents in an LRU cache (bounded by entries and bytes).
+
+    A cached document younger than `revalidate_seconds` is returned without
+    touching the network. Older ones are revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged file costs a 304 and no re-parse.
+    Bodies larger than `max_bytes` are rejected while streaming.
+    """
+    def __init__(self, timeout: float = 10, max_connections: int = 20, max_bytes: int = 20 * 1024 * 1024,
+                 max_entries: int = 64, max_cache_bytes: int = 64 * 1024 * 1024, revalidate_seconds: float = 30):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_cache_bytes = max_cache_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        # url -> {"document", "etag", "last_modified", "size", "checked_at"}
+        self._entries = OrderedDict()
+        self._cache_bytes = 0
+        self._counters = {"fresh_hits": 0, "revalidated": 0, "downloads": 0, "bytes_downloaded": 0, "evictions": 0}
+
+    def _store(self, url: str, entry: dict):
+        old = self._entries.pop(url, None)
+        if old:
+            self._cache_bytes -= old["size"]
+        if entry["size"] > self.max_cache_bytes:
+            return
+        self._entries[url] = entry
+        self._cache_bytes += entry["size"]
+        while len(self._entries) > self.max_entries or self._cache_bytes > self.max_cache_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._cache_bytes -= evicted["size"]
+            self._counters["evictions"] += 1
+
+    async def _download(self, url: str, headers: dict) -> tuple:
+        """Returns (status_code, response headers, body); the body is empty on 304."""
+        async with self.client.stream("GET", url, headers=headers) as resp:
+            if resp.status_code == 304:
+                return resp.status_code, resp.headers, b""
+            if resp.status_code >= 400:
+                raise RemoteFetchError(f"GET {url} returned {resp.status_code}", 502)
+
+            declared = resp.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise RemoteFetchError(f"{url} exceeds {self.max_bytes} bytes", 413)
+            chunks, size = [], 0
+            async for chunk in resp.aiter_bytes():
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise RemoteFetchError(f"{url} exceeds {self.max_bytes} bytes", 413)
+                chunks.append(chunk)
+            return resp.status_code, resp.headers, b"".join(chunks)
+
+    async def get_json(self, url: str):
+        entry = self._entries.get(url)
+        if entry:
+            self._entries.move_to_end(url)
+            if time.monotonic() - entry["checked_at"] < self.revalidate_seconds:
+                self._counters["fresh_hits"] += 1
+                return entry["document"]
+
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            status_code, resp_headers, body = await self._download(url, headers)
+        except httpx.TimeoutException:
+            raise RemoteFetchError(f"Timed out fetching {url}", 504)
+        except httpx.HTTPError as e:
+            raise RemoteFetchError(f"Could not fetch {url}: {e}", 502)
+
+        if status_code == 304 and entry:
+            entry["checked_at"] = time.monotonic()
+            self._counters["revalidated"] += 1
+            return entry["document"]
+
+        try:
+            document = json.loads(body)
+        except ValueError:
+            raise RemoteFetchError(f"{url} is not valid JSON", 422)
+
+        self._counters["downloads"] += 1
+        self._counters["bytes_downloaded"] += len(body)
+        etag, last_modified = resp_headers.get("etag"), resp_headers.get("last-modified")
+        if etag or last_modified or self.revalidate_seconds > 0:
+            self._store(url, {
+                "document": document,
+                "etag": etag,
+                "last_modified": last_modified,
+                "size": len(body),
+                "checked_at": time.monotonic(),
+            })
+        return document
+
+    async def get_many(self, *urls: str) -> list:
+        """Fetches several documents concurrently; fails if any of them fails."""
+        return await asyncio.gather(*(self.get_json(url) for url in urls))
+
+    def stats(self) -> dict:
+        return {
+            **self._counters,
+            "cached_documents": len(self._entries),
+            "cached_bytes": self._cache_bytes,
+        }
+
+    async def close(self):
+        await self.client.aclose()
+
+remote_fetcher = RemoteFetcher(
+    timeout=settings.FETCH_TIMEOUT_SECONDS,
+    max_connections=settings.FETCH_MAX_CONNECTIONS,
+    max_bytes=settings.FETCH_MAX_BYTES,
+    max_entries=settings.FETCH_CACHE_MAX_ENTRIES,
+    max_cache_bytes=settings.FETCH_CACHE_MAX_BYTES,
+    revalidate_seconds=settings.FETCH_REVALIDATE_SECONDS,
+)
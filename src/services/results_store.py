@@ -0,0 +1,259 @@
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import timezone
+from typing import List, Optional
+from src.core.config import settings
+from src.models.schemas import EvaluationResult
+
+class ResultsStore(ABC):
+    """Storage interface for finished evaluations. Queries are awaitable; add() never does I/O."""
+
+    @abstractmethod
+    def add(self, result: EvaluationResult):
+        ...
+
+    @abstractmethod
+    def record_escalation(self, tier1: dict, tier3: dict):
+        """Stores the Tier 1 and Tier 3 verdicts of one escalated item (calibration data)."""
+        ...
+
+    @abstractmethod
+    async def conversation_history(self, conversation_id: int, limit: int = 100) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def daily_aggregates(self, days: int = 30, model: Optional[str] = None) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def agreement_by_bucket(self, tolerance: float = 0.2, days: int = 30) -> List[dict]:
+        """Tier 1 / Tier 3 agreement rate grouped by the Tier 1 min score, in 0.1 buckets. Blocking."""
+        ...
+
+    def flush(self) -> bool:
+        return True
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        await asyncio.to_thread(self.flush)
+
+    def stats(self) -> dict:
+        return {}
+
+
+class SQLiteResultsStore(ResultsStore):
+    """
+    Results are buffered in memory and written with one executemany() per
+    `batch_size` rows (or every `flush_seconds`, whichever comes first).
+    Writes run in a worker thread; a failed write is logged and its rows are
+    kept for the next flush. Aggregates are computed by SQLite over the
+    indexed columns; rows are never pulled into Python to be summed.
+    The file is opened on first use (normally at startup), not at import.
+    """
+    def __init__(self, path: str, batch_size: int = 200, flush_seconds: float = 2):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._buffer = []
+        self._escalations = []
+        self._written = 0
+        self._failed_flushes = 0
+        # `_lock` only guards the in-memory buffers, so add() on the event loop never waits on SQLite.
+        # `_db_lock` serialises use of the connection, which may wait up to `timeout` for the file lock.
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._task = None
+        self._flushing: Optional[asyncio.Task] = None
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        """The connection, opened on first use. Callers hold `_db_lock`."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, conversation_id INTEGER NOT NULL, "
+                "relevance_score REAL NOT NULL, faithfulness_score REAL NOT NULL, "
+                "chat_latency_seconds REAL NOT NULL, eval_execution_seconds REAL NOT NULL, "
+                "estimated_cost_usd REAL NOT NULL, evaluator_model TEXT NOT NULL, reasoning TEXT, "
+                "created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_eval_conversation ON evaluations(conversation_id, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_eval_model ON evaluations(evaluator_model, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_eval_created ON evaluations(created_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS escalations ("
+                "tier1_relevance REAL NOT NULL, tier1_faithfulness REAL NOT NULL, "
+                "tier3_relevance REAL NOT NULL, tier3_faithfulness REAL NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_escalations_created ON escalations(created_at)")
+            self._conn = conn
+        return self._conn
+
+    def add(self, result: EvaluationResult):
+        row = (
+            result.conversation_id, result.relevance_score, result.faithfulness_score,
+            result.chat_latency_seconds, result.eval_execution_seconds, result.estimated_cost_usd,
+            result.evaluator_model, result.reasoning,
+            # EvaluationResult timestamps are naive UTC
+            result.timestamp.replace(tzinfo=timezone.utc).timestamp(),
+        )
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._flush_soon()
+
+    def record_escalation(self, tier1: dict, tier3: dict):
+        row = (tier1.get("relevance_score", 0), tier1.get("faithfulness_score", 0),
+               tier3.get("relevance_score", 0), tier3.get("faithfulness_score", 0), time.time())
+        with self._lock:
+            self._escalations.append(row)
+
+    def _flush_soon(self):
+        """Starts a background flush unless one is already running (the caller paid for the result; never raise)."""
+        if self._flushing and not self._flushing.done():
+            return
+        try:
+            self._flushing = asyncio.get_running_loop().create_task(asyncio.to_thread(self.flush))
+        except RuntimeError:
+            # No event loop (offline use): the next flush() or stop() writes the rows.
+            pass
+
+    def flush(self) -> bool:
+        """Writes buffered rows. Blocking; returns False (rows kept for retry) if the write failed."""
+        with self._db_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                escalations, self._escalations = self._escalations, []
+            if not rows and not escalations:
+                return True
+            try:
+                conn = self._db()
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(
+                        "INSERT INTO evaluations (conversation_id, relevance_score, faithfulness_score, "
+                        "chat_latency_seconds, eval_execution_seconds, estimated_cost_usd, evaluator_model, "
+                        "reasoning, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    conn.executemany("INSERT INTO escalations VALUES (?, ?, ?, ?, ?)", escalations)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            except Exception as e:
+                # Keep the rows for the next flush instead of dropping them.
+                with self._lock:
+                    self._buffer = rows + self._buffer
+                    self._escalations = escalations + self._escalations
+                self._failed_flushes += 1
+                print(f"[Results Store] Flush of {len(rows)} rows failed: {e}")
+                return False
+            self._written += len(rows)
+            return True
+
+    def _conversation_history(self, conversation_id: int, limit: int) -> List[dict]:
+        self.flush()
+        with self._db_lock:
+            rows = self._db().execute(
+                "SELECT conversation_id, relevance_score, faithfulness_score, chat_latency_seconds, "
+                "eval_execution_seconds, estimated_cost_usd, evaluator_model, reasoning, "
+                "strftime('%Y-%m-%dT%H:%M:%fZ', created_at, 'unixepoch') AS timestamp "
+                "FROM evaluations WHERE conversation_id = ? ORDER BY created_at DESC LIMIT ?",
+                (conversation_id, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def conversation_history(self, conversation_id: int, limit: int = 100) -> List[dict]:
+        return await asyncio.to_thread(self._conversation_history, conversation_id, limit)
+
+    def _daily_aggregates(self, days: int, model: Optional[str]) -> List[dict]:
+        self.flush()
+        # `model` narrows the counts, scores and cost. Escalation and cache hit rates stay over the whole
+        # day: filtered to one model they would be trivially 0 or 1. Escalation rate = share of
+        # LLM-judged evaluations that ended on the Tier 3 model.
+        query = (
+            "SELECT date(created_at, 'unixepoch') AS day, SUM(selected) AS evaluations, "
+            "AVG(CASE WHEN selected THEN relevance_score END) AS mean_relevance, "
+            "AVG(CASE WHEN selected THEN faithfulness_score END) AS mean_faithfulness, "
+            "CAST(SUM(evaluator_model = :tier3) AS REAL) / "
+            "NULLIF(SUM(evaluator_model IN (:tier1, :tier3)), 0) AS escalation_rate, "
+            "AVG(evaluator_model = 'Cache-Hit') AS cache_hit_rate, "
+            "SUM(CASE WHEN selected THEN estimated_cost_usd ELSE 0 END) AS total_cost_usd, "
+            "AVG(CASE WHEN selected THEN eval_execution_seconds END) AS mean_eval_seconds "
+            "FROM (SELECT *, (:model IS NULL OR evaluator_model = :model) AS selected "
+            "FROM evaluations WHERE created_at >= :since) "
+            "GROUP BY day HAVING SUM(selected) > 0 ORDER BY day"
+        )
+        params = {
+            "since": time.time() - days * 86400,
+            "tier1": settings.MODEL_TIER_1,
+            "tier3": settings.MODEL_TIER_3,
+            "model": model or None,
+        }
+        with self._db_lock:
+            rows = self._db().execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    async def daily_aggregates(self, days: int = 30, model: Optional[str] = None) -> List[dict]:
+        return await asyncio.to_thread(self._daily_aggregates, days, model)
+
+    def agreement_by_bucket(self, tolerance: float = 0.2, days: int = 30) -> List[dict]:
+        self.flush()
+        with self._db_lock:
+            rows = self._db().execute(
+                "SELECT MIN(CAST(MIN(tier1_relevance, tier1_faithfulness) * 10 AS INTEGER), 9) AS bucket, "
+                "COUNT(*) AS samples, "
+                "AVG(ABS(MIN(tier1_relevance, tier1_faithfulness) - MIN(tier3_relevance, tier3_faithfulness)) <= ?) "
+                "AS agreement FROM escalations WHERE created_at >= ? GROUP BY bucket ORDER BY bucket",
+                (tolerance, time.time() - days * 86400),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await asyncio.to_thread(self.flush)
+
+    def _open(self):
+        with self._db_lock:
+            self._db()
+
+    def _close(self):
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def start(self):
+        await asyncio.to_thread(self._open)
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._flushing:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+        await asyncio.to_thread(self.flush)
+        await asyncio.to_thread(self._close)
+
+    def stats(self) -> dict:
+        return {"backend": "sqlite", "path": self.path, "buffered": len(self._buffer), "written": self._written,
+                "failed_flushes": self._failed_flushes}
+
+results_store = SQLiteResultsStore(
+    settings.RESULTS_DB_PATH,
+    batch_size=settings.RESULTS_BATCH_SIZE,
+    flush_seconds=settings.RESULTS_FLUSH_SECONDS,
+)
@@ -0,0 +1,121 @@
+import re
+import zlib
+import numpy as np
+from typing import Optional
+from src.core.config import settings
+from src.services.cache_keys import canonicalize
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+class HashedNgramEmbedder:
+    """
+    CPU-only text embedding: words plus their boundary-padded character
+    trigrams, hashed into a fixed number of buckets and L2-normalized. crc32 is used
+    instead of hash() so vectors are stable across processes.
+    """
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        text = canonicalize(text)
+        words = _WORD.findall(text)
+        grams = words + [f" {w} "[i:i + 3] for w in words for i in range(len(w))]
+
+        vec = np.zeros(self.dim, dtype=np.float32)
+        if grams:
+            idx = np.fromiter((zlib.crc32(g.encode()) % self.dim for g in grams), dtype=np.int64, count=len(grams))
+            vec = np.bincount(idx, minlength=self.dim).astype(np.float32)
+            vec /= np.linalg.norm(vec)
+        return vec
+
+
+class SemanticCache:
+    """
+    Layer 0.5: reuses the verdict of a near-duplicate (query, response) pair
+    that was audited against the same context.
+
+    Query and response vectors live in preallocated matrices used as a ring
+    buffer (oldest entry is overwritten first), so a lookup is two matrix-vector
+    products over at most `max_entries` rows. A match requires BOTH the query
+    and the response similarity to clear the threshold, and the numbers quoted
+    in both responses must be identical (a changed price is never a paraphrase).
+    """
+    def __init__(self, threshold: float = 0.92, max_entries: int = 5000, dim: int = 512, embedder=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embedder = embedder or HashedNgramEmbedder(dim)
+        self._q = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self._r = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self._ctx = np.zeros(max_entries, dtype=np.int64)
+        self._nums = np.zeros(max_entries, dtype=np.int64)
+        self._verdicts = [None] * max_entries
+        self._count = 0
+        self._next = 0
+        self._counters = {"lookups": 0, "hits": 0, "evictions": 0, "audits": 0, "false_reuses": 0}
+
+    @staticmethod
+    def _ctx_id(context_digest: str) -> int:
+        return int(context_digest[:15], 16)
+
+    @staticmethod
+    def _numbers_id(response: str) -> int:
+        return zlib.crc32("|".join(sorted(_NUMBER.findall(response))).encode())
+
+    def lookup(self, query: str, response: str, context_digest: str) -> Optional[dict]:
+        self._counters["lookups"] += 1
+        if not self._count:
+            return None
+
+        n = self._count
+        candidates = (self._ctx[:n] == self._ctx_id(context_digest)) & (self._nums[:n] == self._numbers_id(response))
+        if not candidates.any():
+            return None
+
+        q_sim = self._q[:n] @ self.embedder.embed(query)
+        r_sim = self._r[:n] @ self.embedder.embed(response)
+        score = np.where(candidates, np.minimum(q_sim, r_sim), -1.0)
+        best = int(np.argmax(score))
+        if score[best] < self.threshold:
+            return None
+
+        self._counters["hits"] += 1
+        return {**self._verdicts[best], "similarity": round(float(score[best]), 4)}
+
+    def add(self, query: str, response: str, context_digest: str, verdict: dict):
+        slot = self._next
+        if self._count == self.max_entries:
+            self._counters["evictions"] += 1
+        else:
+            self._count += 1
+
+        self._q[slot] = self.embedder.embed(query)
+        self._r[slot] = self.embedder.embed(response)
+        self._ctx[slot] = self._ctx_id(context_digest)
+        self._nums[slot] = self._numbers_id(response)
+        self._verdicts[slot] = verdict
+        self._next = (slot + 1) % self.max_entries
+
+    def record_audit(self, reused: dict, fresh: dict, tolerance: float = 0.2):
+        """Compares a reused verdict against a fresh LLM verdict for the same interaction."""
+        self._counters["audits"] += 1
+        if (abs(reused["relevance_score"] - fresh["relevance_score"]) > tolerance or
+                abs(reused["faithfulness_score"] - fresh["faithfulness_score"]) > tolerance):
+            self._counters["false_reuses"] += 1
+
+    def stats(self) -> dict:
+        c = self._counters
+        return {
+            "size": self._count,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            **c,
+            "hit_rate": round(c["hits"] / c["lookups"], 4) if c["lookups"] else 0.0,
+            "false_reuse_rate": round(c["false_reuses"] / c["audits"], 4) if c["audits"] else 0.0,
+        }
+
+semantic_cache = SemanticCache(
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    dim=settings.SEMANTIC_CACHE_DIM,
+) if settings.SEMANTIC_CACHE_ENABLED else None
@@ -0,0 +1,85 @@
+import ijson
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from src.models.schemas import EvaluationRequest
+
+_VECTOR_PREFIXES = ("data.vector_data.item", "vector_data.item")
+
+def _first_byte(fp: BinaryIO) -> bytes:
+    while True:
+        pos = fp.tell()
+        ch = fp.read(1)
+        if not ch or not ch.isspace():
+            fp.seek(pos)
+            return ch
+
+def iter_conversations(fp: BinaryIO) -> Iterator[dict]:
+    """
+    Yields conversation objects one at a time from a JSON object, a JSON array
+    or an NDJSON stream, so a multi-conversation export is never loaded whole.
+    """
+    if _first_byte(fp) == b"[":
+        yield from ijson.items(fp, "item")
+    else:
+        yield from ijson.items(fp, "", multiple_values=True)
+
+def iter_vector_items(fp: BinaryIO) -> Iterator[Tuple[str, Optional[int]]]:
+    """Yields (text, tokens) per vector item, for both `data.vector_data` and top-level `vector_data` layouts."""
+    builder = None
+    item_prefix = None
+    for prefix, event, value in ijson.parse(fp):
+        if builder is None:
+            if event == "start_map" and prefix in _VECTOR_PREFIXES:
+                builder, item_prefix = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
+            continue
+        builder.event(event, value)
+        if event == "end_map" and prefix == item_prefix:
+            item = builder.value
+            tokens = item.get("tokens")
+            yield item.get("text", ""), int(tokens) if tokens is not None else None
+            builder = None
+
+def load_context(fp: BinaryIO) -> Tuple[List[str], List[Optional[int]]]:
+    texts, tokens = [], []
+    for text, count in iter_vector_items(fp):
+        texts.append(text)
+        tokens.append(count)
+    return texts, tokens
+
+def vector_items_of(vector_data: dict) -> list:
+    if 'data' in vector_data and 'vector_data' in vector_data['data']:
+        return vector_data['data']['vector_data']
+    return vector_data.get('vector_data', [])
+
+def pair_turns(chat_data: dict, context_texts: List[str], context_tokens: Optional[List[Optional[int]]] = None,
+               turns: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, EvaluationRequest]]:
+    """
+    Pairs each AI turn with the most recent user turn before it.
+    `turns` restricts the result to those AI turn numbers; None keeps every AI turn.
+    """
+    conversation_turns = chat_data.get('chat_conversation', {}).get('conversation_turns', chat_data.get('conversation_turns', []))
+    wanted = set(turns) if turns is not None else None
+
+    user_turn = None
+    for turn in conversation_turns:
+        if turn['role'] == 'User':
+            user_turn = turn
+        elif turn['role'] == 'AI/Chatbot' and user_turn is not None:
+            if wanted is not None and turn['turn'] not in wanted:
+                continue
+            yield turn['turn'], EvaluationRequest(
+                conversation_id=chat_data.get('chat_id', 0),
+                user_query=user_turn['message'],
+                ai_response=turn['message'],
+                context_texts=context_texts,
+                context_tokens=context_tokens,
+                user_timestamp=user_turn['created_at'],
+                ai_timestamp=turn['created_at']
+            )
+
+def stream_turn_requests(chat_fp: BinaryIO, vector_fp: BinaryIO,
+                         turns: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, EvaluationRequest]]:
+    """Lazily yields (turn, EvaluationRequest) for every conversation in `chat_fp` against one vector export."""
+    context_texts, context_tokens = load_context(vector_fp)
+    for chat_data in iter_conversations(chat_fp):
+        yield from pair_turns(chat_data, context_texts, context_tokens, turns)
@@ -0,0 +1,209 @@
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, Optional, Tuple
+from src.core.config import settings
+
+# Latency buckets in seconds, from sub-millisecond screens to slow Tier 3 calls.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """
+    Base for the metric types. Values live in a plain dict keyed by the label
+    values tuple; the event loop is single-threaded, so updates need no lock.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def samples(self) -> list:
+        """[(suffix, label string, value)] for the exposition format."""
+        return [("", _labels(self.labelnames, labels), value) for labels, value in self._values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{self.name}{suffix}{labels} {_number(value)}" for suffix, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Set directly, or computed at scrape time by `fn` (returning {label values tuple: value})."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), fn: Optional[Callable[[], dict]] = None,
+                 kind: str = "gauge"):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+        self.kind = kind
+
+    def set(self, *labels, value: float):
+        self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def samples(self) -> list:
+        if self.fn is not None:
+            try:
+                self._values = {tuple(k) if isinstance(k, tuple) else (k,): v for k, v in self.fn().items()}
+            except Exception as e:
+                print(f"[Metrics] Collector for {self.name} failed: {e}")
+                return []
+        return super().samples()
+
+
+class Histogram(Metric):
+    """Fixed buckets chosen up front; an observation is one bisect and three additions."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        state = self._values.get(labels)
+        if state is None:
+            # [bucket counts (last one is +Inf), sum, count]
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self) -> list:
+        out = []
+        for labels, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                out.append(("_bucket", _labels(self.labelnames, labels, f'le="{le}"'), cumulative))
+            out.append(("_sum", _labels(self.labelnames, labels), total))
+            out.append(("_count", _labels(self.labelnames, labels), count))
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = (), fn: Optional[Callable[[], dict]] = None,
+              kind: str = "gauge") -> Gauge:
+        return self.register(Gauge(name, help, labelnames, fn, kind))
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+metrics = Registry()
+
+LAYER_SECONDS = metrics.histogram(
+    "eval_layer_seconds", "Time spent in each pipeline stage of an evaluation.", ("layer",)
+)
+EVALUATION_SECONDS = metrics.histogram(
+    "eval_duration_seconds", "End-to-end evaluation time, by the layer that produced the verdict.", ("evaluator",)
+)
+EVALUATIONS = metrics.counter("eval_evaluations_total", "Finished evaluations by deciding layer/model.", ("evaluator",))
+LLM_REQUESTS = metrics.counter("llm_requests_total", "LLM call attempts by model and outcome.", ("model", "status"))
+LLM_TOKENS = metrics.counter("llm_tokens_total", "Tokens billed per model.", ("model", "direction"))
+LLM_COST = metrics.counter("llm_cost_usd_total", "Estimated LLM spend per model in USD.", ("model",))
+LLM_PATH_SECONDS = metrics.histogram(
+    "eval_llm_path_seconds", "End-to-end time of LLM-judged evaluations by hedging mode.", ("hedging",)
+)
+LLM_IN_FLIGHT = metrics.gauge("llm_in_flight", "LLM calls currently in flight per model.", ("model",))
+
+
+# --- Trace spans (optional, TRACING_ENABLED) ---
+_current_trace: ContextVar[Optional[dict]] = ContextVar("eval_trace", default=None)
+recent_traces = deque(maxlen=settings.TRACE_BUFFER_SIZE)
+
+class trace:
+    """Collects the spans of one evaluation; finished traces go to `recent_traces`."""
+    __slots__ = ("name", "attrs", "token", "data")
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.token = None
+        self.data = None
+
+    def __enter__(self):
+        if settings.TRACING_ENABLED:
+            self.data = {"trace_id": uuid.uuid4().hex, "name": self.name, **self.attrs,
+                         "start": time.time(), "_t0": time.perf_counter(), "spans": []}
+            self.token = _current_trace.set(self.data)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.data is not None:
+            _current_trace.reset(self.token)
+            self.data["duration_ms"] = round((time.perf_counter() - self.data.pop("_t0")) * 1000, 3)
+            if exc_type is not None:
+                self.data["error"] = exc_type.__name__
+            recent_traces.append(self.data)
+        return False
+
+
+class timed:
+    """
+    Times a block into LAYER_SECONDS{layer} and, when a trace is active,
+    appends it as a span.
+    """
+    __slots__ = ("layer", "start")
+
+    def __init__(self, layer: str):
+        self.layer = layer
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        LAYER_SECONDS.observe(end - self.start, self.layer)
+        current = _current_trace.get()
+        if current is not None:
+            current["spans"].append({
+                "name": self.layer,
+                "offset_ms": round((self.start - current["_t0"]) * 1000, 3),
+                "duration_ms": round((end - self.start) * 1000, 3),
+            })
+        return False
@@ -0,0 +1,107 @@
+import warnings
+import numpy as np
+from typing import Iterable, List
+from src.utils.metrics import parse_timestamp
+
+PERCENTILES = (50, 90, 95, 99)
+
+def to_datetime64(values: List[str]) -> np.ndarray:
+    """
+    ISO-8601 strings -> datetime64[us] (UTC), NaT where unparseable.
+
+    UTC values in the export format are converted by NumPy in one call; only
+    values with another offset or layout go through parse_timestamp one by one.
+    """
+    stripped = np.array([v[:-1] if v.endswith("Z") else v[:-6] if v.endswith("+00:00") else v for v in values],
+                        dtype=object)
+    try:
+        # NumPy only warns on a non-UTC offset; those values take the slow path too.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", UserWarning)
+            return stripped.astype("datetime64[us]")
+    except (ValueError, UserWarning):
+        pass
+
+    out = np.empty(len(values), dtype="datetime64[us]")
+    for i, value in enumerate(values):
+        parsed = parse_timestamp(value)
+        out[i] = np.datetime64(parsed.replace(tzinfo=None) - parsed.utcoffset(), "us") if parsed else np.datetime64("NaT")
+    return out
+
+def _percentiles(values: np.ndarray) -> dict:
+    if not len(values):
+        return {f"p{p}": None for p in PERCENTILES}
+    return {f"p{p}": round(float(v), 3) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+def analyze_conversations(conversations: Iterable[dict], sla_seconds: float = 30.0) -> dict:
+    """
+    User -> AI response latency for every turn pair of every conversation.
+
+    Turns are flattened into arrays once; each AI turn is paired with the most
+    recent user turn of the same conversation (the pairing the evaluator uses),
+    found with a running maximum over user positions. Gaps, percentiles,
+    per-conversation summaries and SLA breaches are then array operations.
+    """
+    conv_ids, conv_of_turn, is_user, is_ai, stamps = [], [], [], [], []
+    for conversation in conversations:
+        turns = conversation.get("chat_conversation", {}).get("conversation_turns", conversation.get("conversation_turns", []))
+        index = len(conv_ids)
+        conv_ids.append(conversation.get("chat_id", 0))
+        for turn in turns:
+            conv_of_turn.append(index)
+            is_user.append(turn.get("role") == "User")
+            is_ai.append(turn.get("role") == "AI/Chatbot")
+            stamps.append(turn.get("created_at") or "")
+
+    conv_of_turn = np.asarray(conv_of_turn, dtype=np.int64)
+    is_user = np.asarray(is_user, dtype=bool)
+    is_ai = np.asarray(is_ai, dtype=bool)
+    times = to_datetime64(stamps)
+
+    positions = np.arange(len(stamps))
+    last_user = np.maximum.accumulate(np.where(is_user, positions, -1)) if len(stamps) else positions
+    # An AI turn counts only if its conversation had a user turn before it.
+    ai_pos = positions[is_ai]
+    user_pos = last_user[is_ai]
+    paired = user_pos >= 0
+    paired[paired] = conv_of_turn[user_pos[paired]] == conv_of_turn[ai_pos[paired]]
+    ai_pos, user_pos = ai_pos[paired], user_pos[paired]
+
+    gaps = (times[ai_pos] - times[user_pos]) / np.timedelta64(1, "s")
+    valid = ~np.isnan(gaps) & (gaps >= 0)
+    pair_conv = conv_of_turn[ai_pos]
+    good_gaps, good_conv = gaps[valid], pair_conv[valid]
+
+    breaches = good_gaps > sla_seconds
+    overall = {
+        "conversations": len(conv_ids),
+        "turn_pairs": int(len(gaps)),
+        "invalid_pairs": int((~valid).sum()),
+        "mean": round(float(good_gaps.mean()), 3) if len(good_gaps) else None,
+        "max": round(float(good_gaps.max()), 3) if len(good_gaps) else None,
+        **_percentiles(good_gaps),
+        "sla_seconds": sla_seconds,
+        "sla_breaches": int(breaches.sum()),
+        "sla_breach_rate": round(float(breaches.mean()), 4) if len(good_gaps) else 0.0,
+    }
+
+    # Per conversation: sort by (conversation, gap) once, then read group boundaries.
+    per_conversation = []
+    if len(good_gaps):
+        order = np.lexsort((good_gaps, good_conv))
+        sorted_conv, sorted_gaps = good_conv[order], good_gaps[order]
+        groups, starts, counts = np.unique(sorted_conv, return_index=True, return_counts=True)
+        sums = np.add.reduceat(sorted_gaps, starts)
+        group_breaches = np.add.reduceat((sorted_gaps > sla_seconds).astype(np.int64), starts)
+        medians = (sorted_gaps[starts + (counts - 1) // 2] + sorted_gaps[starts + counts // 2]) / 2
+        maxima = sorted_gaps[starts + counts - 1]
+        for g, n, total, med, mx, br in zip(groups, counts, sums, medians, maxima, group_breaches):
+            per_conversation.append({
+                "conversation_id": conv_ids[g],
+                "turn_pairs": int(n),
+                "mean": round(float(total / n), 3),
+                "p50": round(float(med), 3),
+                "max": round(float(mx), 3),
+                "sla_breaches": int(br),
+            })
+    return {"overall": overall, "conversations": per_conversation}
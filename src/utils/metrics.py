@@ -1,11 +1,33 @@
+from datetime import datetime, timezone
+from typing import Optional
 from dateutil import parser
 
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """
+    Parses a `created_at` value. The export format (2025-11-16T17:04:44.000000Z)
+    goes through datetime.fromisoformat; anything else falls back to dateutil.
+    Naive values are taken as UTC. Returns None when the value is unparseable.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parser.parse(value)
+        except (ValueError, OverflowError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
 def calculate_latency(start_str: str, end_str: str) -> float:
-    if not start_str or not end_str:
+    t1 = parse_timestamp(start_str)
+    t2 = parse_timestamp(end_str)
+    if t1 is None or t2 is None:
+        if start_str and end_str:
+            print(f"[Metrics] Unparseable timestamps ({start_str!r}, {end_str!r}); latency recorded as 0.")
         return 0.0
-    try:
-        t1 = parser.parse(start_str)
-        t2 = parser.parse(end_str)
-        return abs((t2 - t1).total_seconds())
-    except Exception:
-        return 0.0
\ No newline at end of file
+    return abs((t2 - t1).total_seconds())
+
+def estimate_tokens(text: str) -> int:
+    """Cheap prompt-size estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
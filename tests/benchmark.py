@@ -0,0 +1,251 @@
+"""
+Load and benchmark harness: runs the FastAPI app in-process against a local
+mock LLM and reports throughput, latency percentiles and cost per pipeline layer.
+
+    python -m tests.benchmark --requests 200 --concurrency 1,8,32 --unique-ratio 0.5
+
+The JSON report goes to stdout (or --output); app logs go to stderr.
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+import httpx
+from tests.mock_llm import MockLLM
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the evaluation pipeline against a mock LLM.")
+    parser.add_argument("--source", choices=["sample", "synthetic"], default="sample",
+                        help="replay turns from data/ or generate items from the sample contexts")
+    parser.add_argument("--requests", type=int, default=200, help="requests per concurrency level")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--unique-ratio", type=float, default=0.5,
+                        help="share of distinct items per level; the rest are repeats (cache / coalescing)")
+    parser.add_argument("--hallucination-rate", type=float, default=0.2,
+                        help="synthetic source: share of responses with an unsupported number")
+    parser.add_argument("--mock-config", help="JSON file of mock profiles keyed by model id (or 'default')")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+def sample_items() -> list:
+    from src.utils.ingest import pair_turns, vector_items_of
+
+    items = []
+    chats = sorted(glob.glob(os.path.join(DATA_DIR, "chats", "*.json")))
+    vectors = sorted(glob.glob(os.path.join(DATA_DIR, "vectors", "*.json")))
+    for chat_path, vector_path in zip(chats, vectors):
+        with open(chat_path) as f:
+            chat_data = json.load(f)
+        with open(vector_path) as f:
+            vector_items = vector_items_of(json.load(f))
+        context_texts = [item.get("text", "") for item in vector_items]
+        context_tokens = [item.get("tokens") for item in vector_items]
+        for _, req in pair_turns(chat_data, context_texts, context_tokens):
+            items.append(json.loads(req.json()))
+    return items
+
+def synthetic_items(n: int, hallucination_rate: float, rng: random.Random) -> list:
+    """Query/response pairs built from single context chunks; some responses get a number the context lacks."""
+    from src.utils.ingest import vector_items_of
+
+    contexts = []
+    for vector_path in sorted(glob.glob(os.path.join(DATA_DIR, "vectors", "*.json"))):
+        with open(vector_path) as f:
+            contexts.append([item.get("text", "") for item in vector_items_of(json.load(f))])
+
+    items = []
+    for i in range(n):
+        texts = rng.choice(contexts)
+        chunk = rng.choice([t for t in texts if len(t) > 80] or texts)
+        sentences = re.split(r"(?<=[.!?])\s+", chunk.strip())
+        response = " ".join(sentences[:2])
+        if rng.random() < hallucination_rate:
+            response += f" The fee is Rs {rng.randint(1000, 99999)} and you can call +91 98{rng.randint(10000000, 99999999)}."
+        topic = " ".join(response.split()[:6])
+        items.append({
+            "conversation_id": 900000 + i,
+            "user_query": f"Can you tell me about {topic}?",
+            "ai_response": response,
+            "context_texts": texts,
+            "user_timestamp": "2024-01-01T10:00:00.000000Z",
+            "ai_timestamp": "2024-01-01T10:00:02.500000Z",
+        })
+    return items
+
+def build_workload(base: list, n: int, unique_ratio: float, salt: str, rng: random.Random) -> list:
+    """
+    `n` payloads over max(1, n * unique_ratio) distinct items, shuffled. The
+    salt makes every level's items distinct from earlier levels, so caches
+    warmed by one level do not flatter the next.
+    """
+    n_unique = max(1, min(n, round(n * unique_ratio)))
+    distinct = []
+    for k in range(n_unique):
+        item = dict(base[k % len(base)])
+        item["user_query"] = f"{item['user_query']} [{salt}-{k}]"
+        distinct.append(item)
+    workload = distinct + [rng.choice(distinct) for _ in range(n - n_unique)]
+    rng.shuffle(workload)
+    return workload
+
+def percentiles(values: list) -> dict:
+    if not values:
+        return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0}
+    arr = np.asarray(values) * 1000
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    return {"p50_ms": round(p50, 2), "p90_ms": round(p90, 2), "p99_ms": round(p99, 2), "mean_ms": round(arr.mean(), 2)}
+
+def layer_of(evaluator_model: str, settings) -> str:
+    return {
+        "Cache-Hit": "L0_cache",
+        "Semantic-Cache-Hit": "L0.5_semantic_cache",
+        "Deterministic-Check": "L1_guardrails",
+        "Deterministic-Claim-Check": "L1.5_claim_screen",
+        settings.MODEL_TIER_1: "L2_tier1",
+        settings.MODEL_TIER_3: "L3_tier3",
+    }.get(evaluator_model, evaluator_model)
+
+async def run_level(client: httpx.AsyncClient, workload: list, concurrency: int) -> list:
+    """Closed-loop load: `concurrency` workers each send their next request as soon as the last returns."""
+    queue = asyncio.Queue()
+    for payload in workload:
+        queue.put_nowait(payload)
+    samples = []
+
+    async def worker():
+        while not queue.empty():
+            payload = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                resp = await client.post("/api/v1/evaluate", json=payload)
+                body = resp.json() if resp.status_code == 200 else None
+                samples.append((time.perf_counter() - start, resp.status_code, body))
+            except Exception:
+                samples.append((time.perf_counter() - start, 0, None))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+def summarize(samples: list, wall_seconds: float, concurrency: int, settings) -> dict:
+    ok = [(latency, body) for latency, status, body in samples if status == 200]
+    by_layer = {}
+    for latency, body in ok:
+        by_layer.setdefault(layer_of(body["evaluator_model"], settings), []).append((latency, body["estimated_cost_usd"]))
+
+    layers = {}
+    for name, rows in sorted(by_layer.items()):
+        layers[name] = {
+            "count": len(rows),
+            "share": round(len(rows) / len(ok), 4),
+            **percentiles([latency for latency, _ in rows]),
+            "cost_per_1k_usd": round(1000 * sum(cost for _, cost in rows) / len(rows), 6),
+        }
+
+    count = lambda *names: sum(layers.get(name, {}).get("count", 0) for name in names)
+    judged = count("L2_tier1", "L3_tier3")
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "wall_seconds": round(wall_seconds, 4),
+        "throughput_rps": round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency": percentiles([latency for latency, _ in ok]),
+        "cache_hit_rate": round(count("L0_cache", "L0.5_semantic_cache") / len(ok), 4) if ok else 0.0,
+        "escalation_rate": round(count("L3_tier3") / judged, 4) if judged else 0.0,
+        "cost_per_1k_usd": round(1000 * sum(body["estimated_cost_usd"] for _, body in ok) / len(ok), 6) if ok else 0.0,
+        "layers": layers,
+    }
+
+async def run_benchmark(args, mock: MockLLM) -> dict:
+    from src.core.config import settings
+    from src.main import app
+    from src.routes.eval_routes import audit_service
+
+    rng = random.Random(args.seed)
+    if args.source == "synthetic":
+        base = synthetic_items(max(args.requests, 50), args.hallucination_rate, rng)
+    else:
+        base = sample_items()
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    report = {
+        "config": {
+            "source": args.source,
+            "requests_per_level": args.requests,
+            "unique_ratio": args.unique_ratio,
+            "seed": args.seed,
+            "cache_backend": settings.CACHE_BACKEND,
+            "escalation_policy": settings.ESCALATION_POLICY,
+            "mock_profiles": mock.profiles,
+        },
+        "levels": [],
+    }
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for level in levels:
+                workload = build_workload(base, args.requests, args.unique_ratio, f"c{level}", rng)
+                start = time.perf_counter()
+                samples = await run_level(client, workload, level)
+                report["levels"].append(summarize(samples, time.perf_counter() - start, level, settings))
+    finally:
+        await app.router.shutdown()
+
+    report["pipeline_stats"] = audit_service.stats()
+    report["mock_llm"] = mock.stats()
+    return report
+
+def main(argv=None):
+    args = parse_args(argv)
+    mock = MockLLM(seed=args.seed)
+    base_url = mock.start()
+
+    # Settings are read at import time, so the environment is prepared before importing the app.
+    workdir = tempfile.mkdtemp(prefix="eval-bench-")
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    # Provider budgets are off unless set explicitly, so runs measure the pipeline itself.
+    for name in ("LLM_RPM_TIER_1", "LLM_TPM_TIER_1", "LLM_RPM_TIER_3", "LLM_TPM_TIER_3"):
+        os.environ.setdefault(name, "0")
+    for name, filename in (("RESULTS_DB_PATH", "results.db"), ("JOB_QUEUE_PATH", "jobs.db"), ("CACHE_SQLITE_PATH", "cache.db")):
+        os.environ[name] = os.path.join(workdir, filename)
+
+    from src.core.config import settings
+    profiles = {
+        settings.MODEL_TIER_1: {"latency_median_ms": 300},
+        settings.MODEL_TIER_3: {"latency_median_ms": 800, "completion_tokens_mean": 60},
+    }
+    if args.mock_config:
+        with open(args.mock_config) as f:
+            profiles.update(json.load(f))
+    mock.profiles = {name: {**mock.profile(name), **profile} for name, profile in profiles.items()}
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            report = asyncio.run(run_benchmark(args, mock))
+    finally:
+        mock.stop()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# Settings are read at import time: give the app a dummy key, keep its
+# databases out of the working tree and switch off the provider budgets.
+_workdir = tempfile.mkdtemp(prefix="eval-tests-")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("JOB_QUEUE_PATH", os.path.join(_workdir, "jobs.db"))
+os.environ.setdefault("RESULTS_DB_PATH", os.path.join(_workdir, "results.db"))
+os.environ.setdefault("CACHE_SQLITE_PATH", os.path.join(_workdir, "cache.db"))
+for _name in ("LLM_RPM_TIER_1", "LLM_TPM_TIER_1", "LLM_RPM_TIER_3", "LLM_TPM_TIER_3"):
+    os.environ.setdefault(_name, "0")
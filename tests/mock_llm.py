@@ -0,0 +1,114 @@
+import json
+import time
+import random
+import socket
+import asyncio
+import threading
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+DEFAULT_PROFILE = {
+    # Latency is log-normal: median in ms, sigma of the underlying normal
+    "latency_median_ms": 300,
+    "latency_sigma": 0.35,
+    "completion_tokens_mean": 40,
+    "completion_tokens_std": 10,
+    # Relevance / faithfulness are drawn from Beta(alpha, beta)
+    "score_alpha": 20.0,
+    "score_beta": 1.0,
+    "error_rate": 0.0,
+    "error_status": 503,
+    # Sent as Retry-After when error_status is 429
+    "retry_after_seconds": 1,
+}
+
+class MockLLM:
+    """
+    OpenAI-compatible chat completions endpoint with configurable behaviour
+    per model: latency distribution, token usage, score distribution and
+    injected error rate. Packed prompts (a "results" list over [Item N]
+    blocks) get one verdict per item.
+    """
+    def __init__(self, profiles: dict = None, seed: int = 0):
+        self.profiles = {name: {**DEFAULT_PROFILE, **profile} for name, profile in (profiles or {}).items()}
+        self.rng = random.Random(seed)
+        self.counters = {}
+        self.app = FastAPI()
+        self.app.post("/{path:path}")(self.chat_completions)
+        self._server = None
+        self._thread = None
+        self.port = None
+
+    def profile(self, model: str) -> dict:
+        return self.profiles.get(model) or self.profiles.get("default") or DEFAULT_PROFILE
+
+    def _count(self, model: str, key: str, amount: int = 1):
+        counters = self.counters.setdefault(model, {"calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0})
+        counters[key] += amount
+
+    def _verdict(self, profile: dict) -> dict:
+        return {
+            "relevance_score": round(self.rng.betavariate(profile["score_alpha"], profile["score_beta"]), 2),
+            "faithfulness_score": round(self.rng.betavariate(profile["score_alpha"], profile["score_beta"]), 2),
+            "reasoning": "Mock verdict.",
+        }
+
+    async def chat_completions(self, path: str, request: Request):
+        body = await request.json()
+        model = body.get("model", "default")
+        profile = self.profile(model)
+        prompt = body["messages"][-1]["content"]
+        self._count(model, "calls")
+
+        latency = profile["latency_median_ms"] / 1000 * self.rng.lognormvariate(0, profile["latency_sigma"])
+        await asyncio.sleep(latency)
+
+        if self.rng.random() < profile["error_rate"]:
+            self._count(model, "errors")
+            headers = {"Retry-After": str(profile["retry_after_seconds"])} if profile["error_status"] == 429 else None
+            return JSONResponse({"error": {"message": "Injected mock failure."}}, status_code=profile["error_status"],
+                                headers=headers)
+
+        if '"results"' in prompt:
+            n_items = prompt.count("[Item ")
+            content = {"results": [{"id": i, **self._verdict(profile)} for i in range(n_items)]}
+        else:
+            n_items = 1
+            content = self._verdict(profile)
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = n_items * max(1, int(self.rng.gauss(profile["completion_tokens_mean"], profile["completion_tokens_std"])))
+        self._count(model, "prompt_tokens", prompt_tokens)
+        self._count(model, "completion_tokens", completion_tokens)
+        return {
+            "id": f"mock-{time.monotonic_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": json.dumps(content)}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def start(self, port: int = 0) -> str:
+        """Serves the mock on 127.0.0.1 in a background thread and returns its base URL."""
+        if not port:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+        self.port = port
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return f"http://127.0.0.1:{port}"
+
+    def stop(self):
+        if self._server:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+
+    def stats(self) -> dict:
+        return {model: dict(counters) for model, counters in self.counters.items()}
@@ -0,0 +1,33 @@
+import json
+import os
+from src.bulk import plan_shards, prepare_shard
+
+DATA = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+VECTORS = os.path.join(DATA, "vectors", "sample_context_vectors-01.json")
+
+def conversation_without_id() -> dict:
+    with open(os.path.join(DATA, "chats", "sample-chat-conversation-01.json")) as f:
+        chat = json.load(f)
+    chat.pop("chat_id", None)
+    return chat
+
+def test_conversations_without_chat_id_get_distinct_item_ids(tmp_path):
+    chats = tmp_path / "export.ndjson"
+    chats.write_text("\n".join(json.dumps(conversation_without_id()) for _ in range(2)) + "\n")
+
+    items = []
+    for shard in plan_shards(str(chats), VECTORS, 64 * 1024 * 1024):
+        items += prepare_shard(shard, None)
+    ids = [item["item_id"] for item in items]
+    assert len(items) % 2 == 0 and items
+    assert len(set(ids)) == len(ids)
+
+def test_item_ids_do_not_depend_on_shard_size(tmp_path):
+    chats = tmp_path / "export.ndjson"
+    chats.write_text("\n".join(json.dumps(conversation_without_id()) for _ in range(3)) + "\n")
+
+    def ids(shard_bytes: int) -> list:
+        return [item["item_id"] for shard in plan_shards(str(chats), VECTORS, shard_bytes)
+                for item in prepare_shard(shard, None)]
+
+    assert ids(64 * 1024 * 1024) == ids(1024)
@@ -0,0 +1,109 @@
+import asyncio
+import fakeredis
+import pytest
+from src.services import cache_backends
+from src.services.cache_backends import MemoryBackend, SQLiteBackend, RedisBackend
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_backends.time, "monotonic", clock)
+    monkeypatch.setattr(cache_backends.time, "time", clock)
+    return clock
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_lru_evicts_least_recently_used(clock):
+    backend = MemoryBackend(max_size=2)
+    run(backend.set("a", {"v": 1}))
+    run(backend.set("b", {"v": 2}))
+    assert run(backend.get("a")) == {"v": 1}  # "a" is now the most recent
+    run(backend.set("c", {"v": 3}))
+
+    assert run(backend.get_many(["a", "b", "c"])) == {"a": {"v": 1}, "c": {"v": 3}}
+    assert run(backend.stats())["evictions"] == 1
+
+def test_overwrite_does_not_evict(clock):
+    backend = MemoryBackend(max_size=2)
+    run(backend.set("a", {"v": 1}))
+    run(backend.set("b", {"v": 2}))
+    run(backend.set("a", {"v": 10}))
+
+    assert run(backend.get_many(["a", "b"])) == {"a": {"v": 10}, "b": {"v": 2}}
+    assert run(backend.stats())["evictions"] == 0
+
+def test_ttl_expires_on_read(clock):
+    backend = MemoryBackend(ttl_seconds=60)
+    run(backend.set("a", {"v": 1}))
+    clock.now += 59
+    assert run(backend.get("a")) == {"v": 1}
+    clock.now += 2
+    assert run(backend.get("a")) is None
+    stats = run(backend.stats())
+    assert stats["size"] == 0 and stats["bytes"] == 0 and stats["expirations"] == 1
+
+def test_sweep_drops_expired_entries_on_write(clock):
+    backend = MemoryBackend(ttl_seconds=60, sweep_interval_seconds=10)
+    run(backend.set("a", {"v": 1}))
+    run(backend.set("b", {"v": 2}))
+    clock.now += 61
+    run(backend.set("c", {"v": 3}))
+
+    stats = run(backend.stats())
+    assert stats["size"] == 1 and stats["expirations"] == 2
+
+def test_byte_budget_evicts_oldest(clock):
+    value = {"text": "x" * 40}
+    size = len(cache_backends.json.dumps(value))
+    backend = MemoryBackend(max_bytes=size * 2)
+    for key in ("a", "b", "c"):
+        run(backend.set(key, value))
+
+    assert set(run(backend.get_many(["a", "b", "c"]))) == {"b", "c"}
+    stats = run(backend.stats())
+    assert stats["bytes"] == size * 2 and stats["evictions"] == 1
+
+def test_value_larger_than_budget_is_not_stored(clock):
+    backend = MemoryBackend(max_bytes=10)
+    run(backend.set("a", {"text": "x" * 40}))
+    assert run(backend.get("a")) is None
+    assert run(backend.stats())["size"] == 0
+
+def test_sqlite_ttl_and_size_budget(tmp_path, clock):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"), max_size=2, ttl_seconds=60, sweep_interval_seconds=0)
+    for i, key in enumerate(("a", "b", "c")):
+        clock.now += 1
+        run(backend.set(key, {"v": i}))
+
+    # The sweep after the third write drops the soonest-to-expire entry.
+    assert set(run(backend.get_many(["a", "b", "c"]))) == {"b", "c"}
+    clock.now += 120
+    assert run(backend.get_many(["b", "c"])) == {}
+    run(backend.close())
+
+def test_redis_round_trip_and_prefixed_size():
+    client = fakeredis.FakeAsyncRedis()
+    backend = RedisBackend("redis://unused", ttl_seconds=60, prefix="eval:", batch_size=2, client=client)
+
+    async def scenario():
+        await client.set("other-app:key", "x")  # not ours, must not be counted
+        await backend.set("a", {"v": 1})
+        await backend.set_many({"b": {"v": 2}, "c": {"v": 3}})
+        found = await backend.get_many(["a", "b", "c", "missing"])
+        ttl = await client.ttl("eval:a")
+        stats = await backend.stats()
+        await backend.close()
+        return found, ttl, stats
+
+    found, ttl, stats = run(scenario())
+    assert found == {"a": {"v": 1}, "b": {"v": 2}, "c": {"v": 3}}
+    assert 0 < ttl <= 60
+    assert stats == {"backend": "redis", "size": 3}
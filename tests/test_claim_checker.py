@@ -0,0 +1,70 @@
+from src.services.claim_checker import ClaimChecker
+
+# From sample_context_vectors-01.json: prices glued to the words around them.
+HOTEL_CONTEXT = [
+    "Happy Home Hotel. Attached BathroomFood service Room Charges 1400/- Single Room2000/- Double Room. "
+    "This is a 5 minute walk from the clinic."
+]
+
+def claim(result: dict, value: str) -> dict:
+    return next(c for c in result["claims"] if c["value"] == value)
+
+def test_numbers_glued_to_words_are_indexed():
+    result = ClaimChecker().check(
+        "Which hotels are near the clinic?",
+        "Happy Home Hotel offers single rooms for Rs 1400 and double rooms for Rs 2000.",
+        HOTEL_CONTEXT,
+    )
+    assert claim(result, "1400")["supported"]
+    assert claim(result, "2000")["supported"]
+    assert result["flags"] == []
+
+def test_numbers_are_normalised_before_comparing():
+    result = ClaimChecker().check("How much?", "It costs Rs 3,00,000 and takes 14.0 days.",
+                                  ["Total cost: 300000 rupees over 14 days."])
+    assert claim(result, "300000")["supported"]
+    assert claim(result, "14")["supported"]
+
+def test_unsupported_price_is_flagged():
+    result = ClaimChecker().check("Room rates?", "A room costs Rs 2500 per night.", HOTEL_CONTEXT)
+    assert result["flags"] == ["price '2500' not found in context"]
+    assert result["verdict"] is None
+
+def test_query_values_are_excluded_as_whole_tokens():
+    checker = ClaimChecker()
+    # "20" is part of "2025", not a value the user wrote.
+    result = checker.check("Can I visit in 2025?", "Yes, we see 20 patients a day.", ["We are open daily."])
+    assert claim(result, "20")["supported"] is False
+
+    result = checker.check("Is it 20 minutes away?", "Yes, about 20 minutes.", ["We are open daily."])
+    assert result["claims"] == []
+
+def test_settling_is_opt_in():
+    response = "Rooms cost Rs 2500 and Rs 3500 per night."
+    assert ClaimChecker().check("Rates?", response, HOTEL_CONTEXT)["verdict"] is None
+    assert ClaimChecker(enabled=True).check("Rates?", response, HOTEL_CONTEXT)["verdict"] is not None
+
+def test_settling_checks_the_full_context():
+    checker = ClaimChecker(enabled=True)
+    response = "Rooms cost Rs 2500 and Rs 3500 per night."
+    full = HOTEL_CONTEXT + ["Deluxe rooms: 2500/- and suites 3500/-."]
+    result = checker.check("Rates?", response, HOTEL_CONTEXT, full_context=full)
+    assert len(result["flags"]) == 2  # still flagged: the LLM only sees the selected excerpt
+    assert result["verdict"] is None
+
+def test_price_range_is_not_a_phone_number():
+    result = ClaimChecker().check("How much are rooms?", "Rooms cost Rs 1400 - 2000 per night.",
+                                  ["Single room Rs 1400, double room Rs 2000"])
+    assert [c["kind"] for c in result["claims"]] == ["price", "number"]
+    assert claim(result, "2000")["supported"]
+    assert result["flags"] == []
+
+def test_consumed_values_only_hide_exact_matches():
+    result = ClaimChecker().check("Fees?", "The fee is Rs 2000 for 20 minutes.", ["Fee 2000 rupees, 30 minutes."])
+    assert claim(result, "20")["supported"] is False
+
+def test_phone_numbers_are_one_claim():
+    checker = ClaimChecker()
+    for phone in ("+91 98765 43210", "(022) 2345 6789", "9876543210", "022-23456789"):
+        result = checker.check("How do I call?", f"Call us on {phone}.", [f"Phone: {phone}"])
+        assert [(c["kind"], c["supported"]) for c in result["claims"]] == [("phone", True)], phone
@@ -0,0 +1,60 @@
+import pytest
+from src.services import escalation_policy as policy_module
+from src.services.escalation_policy import EscalationPolicy, ThresholdPolicy, BandPolicy, CalibratedPolicy
+from src.services.results_store import SQLiteResultsStore
+
+def verdict(relevance: float, faithfulness: float = None) -> dict:
+    return {"relevance_score": relevance, "faithfulness_score": relevance if faithfulness is None else faithfulness}
+
+def test_policy_must_implement_decide():
+    with pytest.raises(TypeError):
+        EscalationPolicy()
+
+def test_threshold_escalates_anything_below_it():
+    policy = ThresholdPolicy(0.9)
+    assert policy.should_escalate(verdict(0.95, 0.89))
+    assert policy.should_escalate(verdict(0.1))
+    assert not policy.should_escalate(verdict(0.9))
+    assert policy.stats()["escalation_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+def test_band_keeps_confident_verdicts():
+    policy = BandPolicy(low=0.3, high=0.9, explore_rate=0.0)
+    assert policy.should_escalate(verdict(0.5))
+    assert policy.should_escalate(verdict(0.1, 0.3))  # one score inside the band is enough
+    assert not policy.should_escalate(verdict(0.1))   # clear fail
+    assert not policy.should_escalate(verdict(0.95))  # clear pass
+
+def test_band_explores_confident_verdicts(monkeypatch):
+    monkeypatch.setattr(policy_module.random, "random", lambda: 0.01)
+    assert BandPolicy(explore_rate=0.02).should_escalate(verdict(0.95))
+    assert not BandPolicy(explore_rate=0.0).should_escalate(verdict(0.95))
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = SQLiteResultsStore(str(tmp_path / "results.db"))
+    monkeypatch.setattr(policy_module, "results_store", store)
+    yield store
+    store._close()
+
+def test_calibrated_stops_escalating_buckets_the_judges_agree_on(store):
+    for _ in range(30):
+        store.record_escalation(verdict(0.75), verdict(0.8))  # bucket 7: agree
+        store.record_escalation(verdict(0.55), verdict(0.1))  # bucket 5: disagree
+    for _ in range(5):
+        store.record_escalation(verdict(0.35), verdict(0.35))  # bucket 3: agree, too few samples
+
+    policy = CalibratedPolicy(low=0.3, high=0.9, explore_rate=0.0, min_samples=30, target_agreement=0.9)
+    assert not policy.should_escalate(verdict(0.75))
+    assert policy.should_escalate(verdict(0.55))
+    assert policy.should_escalate(verdict(0.35))
+    assert not policy.should_escalate(verdict(0.1))
+    assert policy.stats()["trusted_buckets"] == [7]
+
+def test_calibrated_rereads_only_after_refresh_interval(store):
+    policy = CalibratedPolicy(explore_rate=0.0, min_samples=1, refresh_seconds=3600)
+    assert policy.should_escalate(verdict(0.75))  # nothing recorded yet
+
+    store.record_escalation(verdict(0.75), verdict(0.8))
+    assert policy.should_escalate(verdict(0.75))  # calibration is still the cached one
+    policy._next_refresh = 0.0
+    assert not policy.should_escalate(verdict(0.75))
@@ -0,0 +1,68 @@
+import asyncio
+import uuid
+import pytest
+from src.core.config import settings
+from src.models.schemas import EvaluationRequest
+from src.services.audit_service import AuditService
+from src.services.escalation_policy import escalation_policy
+from src.services.hedge_policy import hedge_policy
+
+class FakeLLM:
+    """Layer 2 answers at once; the Layer 3 hedge is dispatched or not, then hangs until cancelled."""
+    def __init__(self, dispatch_hedge: bool):
+        self.dispatch_hedge = dispatch_hedge
+        self.hedge_cancelled = False
+
+    def saturated(self, model_id: str) -> bool:
+        return False
+
+    async def get_json_response(self, prompt: str, model_id: str, on_dispatch=None) -> dict:
+        if model_id == settings.MODEL_TIER_3:
+            if self.dispatch_hedge:
+                on_dispatch()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.hedge_cancelled = True
+                raise
+        await asyncio.sleep(0.01)
+        return {"content": {"relevance_score": 0.95, "faithfulness_score": 0.95, "reasoning": "Grounded."},
+                "input_tokens": 100, "output_tokens": 20}
+
+@pytest.fixture
+def recorded(monkeypatch):
+    monkeypatch.setattr(settings, "HEDGING_ENABLED", True)
+    monkeypatch.setattr(escalation_policy, "should_escalate", lambda content: False)
+    monkeypatch.setattr(hedge_policy, "should_hedge", lambda *args: True)
+    calls = []
+    monkeypatch.setattr(hedge_policy, "record", lambda *args, **kwargs: calls.append(kwargs))
+    return calls
+
+def evaluate(llm: FakeLLM):
+    service = AuditService()
+    service.llm_client = llm
+    request = EvaluationRequest(conversation_id=1, user_query=f"When does the clinic open? {uuid.uuid4()}",
+                                ai_response="The clinic opens at nine in the morning.",
+                                context_texts=["The clinic opens at nine in the morning."])
+
+    async def scenario():
+        result = await service.evaluate_interaction(request)
+        await asyncio.sleep(0)  # let the cancelled hedge unwind
+        return result
+
+    return asyncio.run(scenario())
+
+def test_hedge_cancelled_before_dispatch_costs_nothing(recorded):
+    llm = FakeLLM(dispatch_hedge=False)
+    result = evaluate(llm)
+    assert llm.hedge_cancelled
+    assert recorded[0]["wasted"] == (0, 0)
+    assert result.estimated_cost_usd == pytest.approx(
+        (100 * settings.INPUT_COST_PER_1K + 20 * settings.OUTPUT_COST_PER_1K) / 1000, abs=1e-6)
+
+def test_dispatched_hedge_is_charged_its_input_tokens(recorded):
+    llm = FakeLLM(dispatch_hedge=True)
+    evaluate(llm)
+    assert llm.hedge_cancelled
+    input_tokens, output_tokens = recorded[0]["wasted"]
+    assert input_tokens > 0 and output_tokens == 0
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import pytest
+from src.services import job_queue as job_queue_module
+from src.services.job_queue import JobQueue, QueueFullError
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_queue_module.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = JobQueue(str(tmp_path / "jobs.db"), workers=1, max_depth=2, max_attempts=3,
+                     retry_base_seconds=2, lease_seconds=300)
+    yield queue
+    queue._close()
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_database_is_opened_lazily(tmp_path):
+    path = tmp_path / "jobs.db"
+    queue = JobQueue(str(path))
+    assert not os.path.exists(path)
+    run(queue.depth())
+    assert os.path.exists(path)
+    queue._close()
+
+def test_enqueue_respects_max_depth(queue):
+    run(queue.enqueue({"n": 1}))
+    run(queue.enqueue({"n": 2}))
+    with pytest.raises(QueueFullError):
+        run(queue.enqueue({"n": 3}))
+
+def test_running_job_is_reclaimed_after_lease(queue, clock):
+    job_id = run(queue.enqueue({"n": 1}))
+    assert queue._claim()["id"] == job_id
+    assert queue._claim() is None  # leased to the first worker
+
+    clock.now += 299
+    assert queue._claim() is None
+    clock.now += 1
+    row = queue._claim()
+    assert row["id"] == job_id
+    assert row["attempts"] == 1
+    assert run(queue.get(job_id))["attempts"] == 2
+
+def test_failed_job_is_retried_with_backoff(queue, clock):
+    job_id = run(queue.enqueue({"n": 1}))
+    queue._claim()
+    queue._fail(job_id, 1, "boom")
+
+    job = run(queue.get(job_id))
+    assert job["status"] == "queued" and job["error"] == "boom"
+    clock.now += 1.9
+    assert queue._claim() is None
+    clock.now += 0.1
+    assert queue._claim()["id"] == job_id
+
+    queue._fail(job_id, 2, "boom")
+    clock.now += 3.9  # second retry waits 2 * 2 ** 1 seconds
+    assert queue._claim() is None
+    clock.now += 0.1
+    assert queue._claim()["id"] == job_id
+
+def test_job_is_dead_lettered_after_max_attempts(queue, clock):
+    job_id = run(queue.enqueue({"n": 1}))
+    queue._claim()
+    queue._fail(job_id, 3, "still broken")
+
+    job = run(queue.get(job_id))
+    assert job["status"] == "dead" and job["error"] == "still broken"
+    clock.now += 3600
+    assert queue._claim() is None
+    assert run(queue.stats())["dead"] == 1
+
+def test_worker_runs_handler_and_stores_result(queue):
+    async def scenario():
+        async def handler(payload):
+            return {"doubled": payload["n"] * 2}
+
+        queue.poll_seconds = 0.01
+        await queue.start(handler)
+        job_id = await queue.enqueue({"n": 21})
+        for _ in range(200):
+            job = await queue.get(job_id)
+            if job["status"] == "done":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return job
+
+    job = run(scenario())
+    assert job["status"] == "done"
+    assert job["result"] == {"doubled": 42}
@@ -0,0 +1,55 @@
+import pytest
+from src.services.audit_service import AuditService
+
+@pytest.fixture(scope="module")
+def parse():
+    return AuditService()._parse_packed
+
+def entry(item_id, relevance=0.9, faithfulness=0.8, **extra):
+    return {"id": item_id, "relevance_score": relevance, "faithfulness_score": faithfulness, "reasoning": "ok", **extra}
+
+def test_well_formed_entries_are_kept(parse):
+    parsed = parse({"results": [entry(0), entry(1, 0.2, 0.1)]}, 2)
+    assert parsed == {
+        0: {"relevance_score": 0.9, "faithfulness_score": 0.8, "reasoning": "ok"},
+        1: {"relevance_score": 0.2, "faithfulness_score": 0.1, "reasoning": "ok"},
+    }
+
+@pytest.mark.parametrize("content", [
+    None,
+    [],
+    "not json",
+    {},
+    {"results": None},
+    {"results": "oops"},
+    {"results": {"0": entry(0)}},
+])
+def test_malformed_envelope_yields_nothing(parse, content):
+    assert parse(content, 3) == {}
+
+@pytest.mark.parametrize("bad", [
+    "not a dict",
+    entry(None),
+    entry("0"),
+    entry(1.0),
+    entry(True),
+    entry(-1),
+    entry(3),
+    entry(0, relevance=1.5),
+    entry(0, faithfulness=-0.1),
+    entry(0, relevance="0.9"),
+    entry(0, faithfulness=None),
+    entry(0, relevance=True),
+])
+def test_malformed_entries_are_dropped(parse, bad):
+    parsed = parse({"results": [bad, entry(2)]}, 3)
+    assert list(parsed) == [2]
+
+def test_duplicate_ids_keep_the_first(parse):
+    parsed = parse({"results": [entry(0, 0.9), entry(0, 0.1)]}, 1)
+    assert parsed[0]["relevance_score"] == 0.9
+
+def test_missing_reasoning_gets_a_default(parse):
+    item = entry(0)
+    del item["reasoning"]
+    assert parse({"results": [item]}, 1)[0]["reasoning"] == "Analysis failed."
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+from src.services import llm_service
+from src.services.llm_service import GroqClient
+from src.services.rate_scheduler import (
+    TokenBucket, ModelScheduler, RateScheduler, PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_BACKGROUND
+)
+from tenacity import RetryError, stop_after_attempt
+
+def test_bucket_refills_at_rate_up_to_capacity():
+    bucket = TokenBucket(per_minute=600, burst_seconds=10)  # 10/s, capacity 100
+    now = time.monotonic()
+    bucket.take(100, now)
+    assert bucket.wait_time(50, now) == pytest.approx(5.0)
+    assert bucket.wait_time(50, now + 5) == 0.0
+    bucket.take(0, now + 60)
+    assert bucket.level == pytest.approx(100)  # capped at capacity
+
+def test_oversized_request_waits_for_a_full_bucket_only():
+    bucket = TokenBucket(per_minute=600, burst_seconds=10)
+    now = time.monotonic()
+    bucket.take(100, now)
+    assert bucket.wait_time(1000, now) == pytest.approx(10.0)
+
+def test_zero_rate_is_unlimited():
+    bucket = TokenBucket(per_minute=0)
+    assert bucket.unlimited
+    assert bucket.wait_time(10 ** 9, time.monotonic()) == 0.0
+
+def test_waiters_are_released_by_priority():
+    # One request per 50 ms and no burst, so every call after the first queues.
+    scheduler = ModelScheduler("m", rpm=1200, tpm=0, burst_seconds=0.05)
+    order = []
+
+    async def call(name: str, priority: int):
+        await scheduler.acquire(1, priority=priority)
+        order.append(name)
+
+    async def scenario():
+        await scheduler.acquire(1)
+        tasks = [asyncio.create_task(call(name, priority)) for name, priority in
+                 (("background", PRIORITY_BACKGROUND), ("batch", PRIORITY_BATCH), ("interactive", PRIORITY_INTERACTIVE))]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert order == ["interactive", "batch", "background"]
+
+def test_rate_limit_pauses_every_caller():
+    scheduler = ModelScheduler("m", rpm=0, tpm=0)
+
+    async def scenario():
+        scheduler.penalize(0.2)
+        assert scheduler.stats()["blocked_for_seconds"] > 0.1
+        start = time.monotonic()
+        await asyncio.gather(scheduler.acquire(1), scheduler.acquire(1))
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.19
+    assert scheduler.stats()["rate_limited"] == 1
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = ModelScheduler("m", rpm=60, tpm=0, burst_seconds=1)
+
+    async def scenario():
+        await scheduler.acquire(1)
+        waiter = asyncio.create_task(scheduler.acquire(1))
+        await asyncio.sleep(0.01)
+        assert scheduler.waiting == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return scheduler.waiting
+
+    assert asyncio.run(scenario()) == 0
+
+def test_failed_call_releases_its_reserved_tokens(monkeypatch):
+    scheduler = RateScheduler({"m": (0, 6000)}, headroom=1.0)
+    monkeypatch.setattr(llm_service, "rate_scheduler", scheduler)
+
+    async def create(**kwargs):
+        raise ConnectionError("connection reset")
+
+    monkeypatch.setattr(llm_service, "client", SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=create)))))
+    once = GroqClient.get_json_response.retry_with(stop=stop_after_attempt(1))
+
+    full = scheduler.for_model("m").tokens.level
+    with pytest.raises(RetryError):
+        asyncio.run(once(GroqClient(), "x" * 400, model_id="m"))
+    assert scheduler.for_model("m").tokens.level == pytest.approx(full, abs=1)
+    assert scheduler.for_model("m").stats()["released"] == 1
+
+def cancelled_call(monkeypatch, dispatch: bool) -> tuple:
+    """Cancels a call to model "m" while it hangs, either in the provider request or before it."""
+    scheduler = RateScheduler({"m": (0, 6000)}, headroom=1.0)
+    monkeypatch.setattr(llm_service, "rate_scheduler", scheduler)
+
+    async def create(**kwargs):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(llm_service, "client", SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(with_raw_response=SimpleNamespace(create=create)))))
+    llm = GroqClient()
+    prompt = "x" * 400
+
+    async def scenario():
+        slot = llm._semaphore("m")
+        if not dispatch:
+            # Every concurrency slot is busy: the call waits before sending anything.
+            for _ in range(slot._value):
+                await slot.acquire()
+        sent = []
+        task = asyncio.create_task(llm.get_json_response(prompt, model_id="m", on_dispatch=lambda: sent.append(1)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return bool(sent)
+
+    full = scheduler.for_model("m").tokens.level
+    sent = asyncio.run(scenario())
+    return sent, full - scheduler.for_model("m").tokens.level
+
+def test_call_cancelled_after_dispatch_keeps_its_input_tokens(monkeypatch):
+    sent, used = cancelled_call(monkeypatch, dispatch=True)
+    assert sent
+    input_estimate = llm_service.estimate_tokens(llm_service.SYSTEM_PROMPT) + llm_service.estimate_tokens("x" * 400)
+    assert used == pytest.approx(input_estimate, abs=3)  # the bucket refills while the call hangs
+
+def test_call_cancelled_before_dispatch_releases_everything(monkeypatch):
+    sent, used = cancelled_call(monkeypatch, dispatch=False)
+    assert not sent
+    assert used == pytest.approx(0, abs=3)
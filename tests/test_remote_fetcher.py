@@ -0,0 +1,158 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.services.remote_fetcher import RemoteFetcher, RemoteFetchError
+
+class Documents:
+    """What the local server serves: path -> body, plus a log of the requests it saw."""
+    def __init__(self):
+        self.bodies = {}
+        self.delay = 0.0
+        self.send_length = True
+        self.requests = []
+
+    def put(self, path: str, document):
+        self.bodies[path] = json.dumps(document).encode()
+
+@pytest.fixture
+def server():
+    documents = Documents()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            documents.requests.append((self.path, self.headers.get("If-None-Match")))
+            time.sleep(documents.delay)
+            body = documents.bodies.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            etag = f'"{hash(body)}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            if documents.send_length:
+                self.send_header("Content-Length", str(len(body)))
+            else:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    documents.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield documents
+    httpd.shutdown()
+    httpd.server_close()
+
+def run(fetcher: RemoteFetcher, coro_fn):
+    async def scenario():
+        try:
+            return await coro_fn()
+        finally:
+            await fetcher.close()
+    return asyncio.run(scenario())
+
+def test_fresh_documents_are_served_from_cache(server):
+    server.put("/chat.json", {"chat_id": 1})
+    fetcher = RemoteFetcher(revalidate_seconds=60)
+
+    async def scenario():
+        return [await fetcher.get_json(server.url + "/chat.json") for _ in range(3)]
+
+    assert run(fetcher, scenario) == [{"chat_id": 1}] * 3
+    assert len(server.requests) == 1
+    assert fetcher.stats()["fresh_hits"] == 2
+
+def test_stale_documents_are_revalidated_with_etag(server):
+    server.put("/chat.json", {"chat_id": 1})
+    fetcher = RemoteFetcher(revalidate_seconds=0)
+
+    async def scenario():
+        first = await fetcher.get_json(server.url + "/chat.json")
+        unchanged = await fetcher.get_json(server.url + "/chat.json")
+        server.put("/chat.json", {"chat_id": 2})
+        changed = await fetcher.get_json(server.url + "/chat.json")
+        return first, unchanged, changed
+
+    assert run(fetcher, scenario) == ({"chat_id": 1}, {"chat_id": 1}, {"chat_id": 2})
+    assert server.requests[0][1] is None
+    assert server.requests[1][1] is not None  # conditional request answered with 304
+    stats = fetcher.stats()
+    assert (stats["downloads"], stats["revalidated"]) == (2, 1)
+
+@pytest.mark.parametrize("send_length", [True, False])
+def test_oversized_body_is_rejected_with_413(server, send_length):
+    server.send_length = send_length  # declared up front, or only noticed while streaming
+    server.put("/big.json", {"text": "x" * 5000})
+    fetcher = RemoteFetcher(max_bytes=1000)
+
+    with pytest.raises(RemoteFetchError) as error:
+        run(fetcher, lambda: fetcher.get_json(server.url + "/big.json"))
+    assert error.value.status_code == 413
+
+def test_error_statuses_and_bad_json(server):
+    server.bodies["/broken.json"] = b"{not json"
+    fetcher = RemoteFetcher()
+
+    async def scenario():
+        codes = []
+        for path in ("/missing.json", "/broken.json"):
+            try:
+                await fetcher.get_json(server.url + path)
+            except RemoteFetchError as e:
+                codes.append(e.status_code)
+        return codes
+
+    assert run(fetcher, scenario) == [502, 422]
+
+def test_cache_evicts_least_recently_used_by_entries_and_bytes(server):
+    for name in "abc":
+        server.put(f"/{name}.json", {"text": name * 100})
+    size = len(server.bodies["/a.json"])
+    fetcher = RemoteFetcher(max_entries=2, max_cache_bytes=10 * size, revalidate_seconds=60)
+
+    async def scenario():
+        await fetcher.get_json(server.url + "/a.json")
+        await fetcher.get_json(server.url + "/b.json")
+        await fetcher.get_json(server.url + "/a.json")  # "a" is now the most recent
+        await fetcher.get_json(server.url + "/c.json")
+        cached = list(fetcher._entries)
+        fetcher.max_cache_bytes = size  # room for one document only
+        server.put("/d.json", {"text": "d" * 100})
+        await fetcher.get_json(server.url + "/d.json")
+        return cached, list(fetcher._entries)
+
+    by_entries, by_bytes = run(fetcher, scenario)
+    assert by_entries == [server.url + "/a.json", server.url + "/c.json"]
+    assert by_bytes == [server.url + "/d.json"]
+    assert fetcher.stats()["evictions"] == 3
+    assert fetcher.stats()["cached_bytes"] == len(server.bodies["/d.json"])
+
+def test_get_many_fetches_concurrently(server):
+    server.put("/chat.json", {"chat_id": 1})
+    server.put("/vectors.json", {"data": []})
+    server.delay = 0.3
+    fetcher = RemoteFetcher()
+
+    async def scenario():
+        start = time.perf_counter()
+        documents = await fetcher.get_many(server.url + "/chat.json", server.url + "/vectors.json")
+        return documents, time.perf_counter() - start
+
+    documents, elapsed = run(fetcher, scenario)
+    assert documents == [{"chat_id": 1}, {"data": []}]
+    assert elapsed < 0.55
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import pytest
+from src.core.config import settings
+from src.models.schemas import EvaluationResult
+from src.services.results_store import SQLiteResultsStore
+
+def result(model: str, score: float = 0.8) -> EvaluationResult:
+    return EvaluationResult(conversation_id=1, relevance_score=score, faithfulness_score=score,
+                            chat_latency_seconds=1.0, eval_execution_seconds=0.5, estimated_cost_usd=0.001,
+                            reasoning="ok", evaluator_model=model)
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteResultsStore(str(tmp_path / "results.db"), batch_size=100)
+    yield store
+    store._close()
+
+def test_database_is_opened_lazily(tmp_path):
+    path = tmp_path / "results.db"
+    store = SQLiteResultsStore(str(path))
+    store.add(result(settings.MODEL_TIER_1))
+    assert not os.path.exists(path)
+    assert store.flush()
+    assert os.path.exists(path)
+    store._close()
+
+def test_failed_flush_keeps_rows_for_retry(store):
+    store.add(result(settings.MODEL_TIER_1))
+    store._open()
+    store._conn.execute("DROP TABLE evaluations")
+
+    assert store.flush() is False
+    assert store.stats()["buffered"] == 1
+
+    store._close()  # reopening recreates the table
+    assert store.flush()
+    stats = store.stats()
+    assert (stats["buffered"], stats["written"], stats["failed_flushes"]) == (0, 1, 1)
+
+def test_full_buffer_flushes_off_the_loop_without_raising(store):
+    store.batch_size = 2
+
+    async def scenario():
+        store._open()
+        store._conn.execute("DROP TABLE evaluations")
+        store.add(result(settings.MODEL_TIER_1))
+        store.add(result(settings.MODEL_TIER_1))  # reaches the threshold; the failed write must not raise here
+        await store._flushing
+
+    asyncio.run(scenario())
+    assert store.stats()["buffered"] == 2
+
+def test_escalation_rate_ignores_the_model_filter(store):
+    for model in (settings.MODEL_TIER_1, settings.MODEL_TIER_1, settings.MODEL_TIER_1, "Cache-Hit"):
+        store.add(result(model))
+    store.add(result(settings.MODEL_TIER_3, score=0.4))
+
+    (everything,) = asyncio.run(store.daily_aggregates())
+    (tier3,) = asyncio.run(store.daily_aggregates(model=settings.MODEL_TIER_3))
+    assert everything["evaluations"] == 5
+    assert tier3["evaluations"] == 1
+    assert tier3["mean_relevance"] == pytest.approx(0.4)
+    assert tier3["escalation_rate"] == everything["escalation_rate"] == pytest.approx(0.25)
+    assert tier3["cache_hit_rate"] == pytest.approx(0.2)
+    assert asyncio.run(store.daily_aggregates(model="unknown")) == []
+
+def test_add_does_not_wait_for_a_blocked_write(store):
+    store._open()
+    other = sqlite3.connect(store.path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")  # another worker holds the file's write lock
+    store.add(result(settings.MODEL_TIER_1))
+    writer = threading.Thread(target=store.flush)
+    writer.start()
+    time.sleep(0.1)  # the flush is now waiting on SQLite
+
+    start = time.perf_counter()
+    store.add(result(settings.MODEL_TIER_1))
+    store.record_escalation({"relevance_score": 0.5}, {"relevance_score": 0.9})
+    assert time.perf_counter() - start < 0.05
+
+    other.execute("COMMIT")
+    writer.join()
+    other.close()
+    assert store.flush()
+    assert store.stats()["written"] == 2